@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for sudoers-audit.
+
+Run with `python -m benchmarks --help` from the repository root.
+"""
@@ -0,0 +1,220 @@
+"""
+Benchmark runner for sudoers-audit.
+
+Generates (or reuses) a synthetic sudoers tree, then times the parser,
+analyze_line, each rule, audit_file, the permission checks and each report
+format. Every benchmark runs in a fresh process so that its peak RSS is
+reported on its own.
+
+Usage: python -m benchmarks --size 10M [--corpus DIR] [--json results.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, parse_size  # noqa: E402
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _corpus_files(corpus: str) -> list[str]:
+    from sudoers_audit.runner import collect_files
+
+    return collect_files(corpus)
+
+
+def _sample_lines(files: list[str], max_lines: int) -> list[str]:
+    def all_lines():
+        for path in files:
+            with open(path, encoding="utf-8") as f:
+                yield from f
+
+    return list(islice(all_lines(), max_lines))
+
+
+def _bench_parse(files, max_lines):
+    from sudoers_audit.parser import parse_line
+
+    lines = _sample_lines(files, max_lines)
+    start = time.perf_counter()
+    for line in lines:
+        parse_line(line)
+    return len(lines), "lines", time.perf_counter() - start
+
+
+def _bench_analyze_line(files, max_lines):
+    from sudoers_audit.auditor import SudoersAuditor
+
+    auditor = SudoersAuditor()
+    lines = _sample_lines(files, max_lines)
+    start = time.perf_counter()
+    for number, line in enumerate(lines, 1):
+        auditor.analyze_line(number, line)
+    return len(lines), "lines", time.perf_counter() - start
+
+
+def _bench_rule(files, max_lines, rule_name):
+    from sudoers_audit.parser import parse_line
+    from sudoers_audit.rules import get_all_rules
+
+    rule = next(r for r in get_all_rules() if type(r).__name__ == rule_name)
+    parsed = [
+        p
+        for p in map(parse_line, _sample_lines(files, max_lines))
+        if p.kind in rule.kinds
+    ]
+    start = time.perf_counter()
+    for line in parsed:
+        rule.check_parsed(line)
+    return len(parsed), "lines", time.perf_counter() - start
+
+
+def _bench_audit_file(files, max_lines):
+    from sudoers_audit.auditor import SudoersAuditor
+
+    auditor = SudoersAuditor()
+    lines = 0
+    start = time.perf_counter()
+    for path in files:
+        auditor.audit_file(path)
+    elapsed = time.perf_counter() - start
+    for path in files:
+        with open(path, "rb") as f:
+            lines += sum(1 for _ in f)
+    return lines, "lines", elapsed
+
+
+def _bench_permissions(files, max_lines):
+    from sudoers_audit.auditor import SudoersAuditor
+    from sudoers_audit.parser import parse_line
+
+    auditor = SudoersAuditor()
+    paths = [
+        argv[0]
+        for parsed in map(parse_line, _sample_lines(files, max_lines))
+        for argv in parsed.argv
+        if argv and argv[0].startswith("/")
+    ]
+    start = time.perf_counter()
+    for path in paths:
+        auditor.check_file_permissions(path)
+    return len(paths), "paths", time.perf_counter() - start
+
+
+def _bench_report(files, max_lines, report_format):
+    from sudoers_audit.auditor import SudoersAuditor
+    from sudoers_audit.reporting import ReportGenerator
+
+    auditor = SudoersAuditor()
+    results = [auditor.audit_file(path) for path in files]
+    issues = sum(len(f.issues) for r in results for f in r.findings)
+    writer = getattr(ReportGenerator, f"generate_{report_format}")
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        writer(results, os.path.join(tmp, f"report.{report_format}"))
+        elapsed = time.perf_counter() - start
+    return issues, "issues", elapsed
+
+
+def _run(name, func, args):
+    units, unit, elapsed = func(*args)
+    return {
+        "benchmark": name,
+        "units": units,
+        "unit": unit,
+        "seconds": elapsed,
+        "per_second": units / elapsed if elapsed else 0.0,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _benchmarks(files, max_lines):
+    from sudoers_audit.rules import get_all_rules
+
+    yield "parse_line", _bench_parse, (files, max_lines)
+    yield "analyze_line", _bench_analyze_line, (files, max_lines)
+    for rule in get_all_rules():
+        name = type(rule).__name__
+        yield f"rule:{name}", _bench_rule, (files, max_lines, name)
+    yield "audit_file", _bench_audit_file, (files, max_lines)
+    yield "check_file_permissions", _bench_permissions, (files, max_lines)
+    for report_format in ("csv", "html", "sarif", "jsonl"):
+        yield (
+            f"report:{report_format}",
+            _bench_report,
+            (
+                files,
+                max_lines,
+                report_format,
+            ),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run sudoers-audit benchmarks.")
+    parser.add_argument(
+        "--size", default="1M", help="Corpus size to generate, e.g. 1K, 10M, 1G"
+    )
+    parser.add_argument(
+        "--corpus",
+        help="Directory holding the corpus (generated there if empty or missing)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Corpus generator seed")
+    parser.add_argument(
+        "--max-lines",
+        type=int,
+        default=200_000,
+        help="Lines sampled for the per-line benchmarks",
+    )
+    parser.add_argument(
+        "--only", help="Run only benchmarks whose name contains this string"
+    )
+    parser.add_argument("--json", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus or tmp
+        if not glob.glob(os.path.join(corpus, "*")):
+            generate_corpus(corpus, parse_size(args.size), CorpusSpec(seed=args.seed))
+        files = _corpus_files(corpus)
+        total = sum(os.path.getsize(path) for path in files)
+        print(f"Corpus: {len(files)} files, {total / 1024:.1f} KiB in {corpus}")
+
+        rows = []
+        print(
+            f"{'benchmark':<32} {'units':>10} {'seconds':>9} {'rate':>20} {'peak RSS':>10}"
+        )
+        for name, func, bench_args in _benchmarks(files, args.max_lines):
+            if args.only and args.only not in name:
+                continue
+            # A fresh process per benchmark keeps peak RSS figures independent
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                row = executor.submit(_run, name, func, bench_args).result()
+            rows.append(row)
+            rate = f"{row['per_second']:,.0f} {row['unit']}/s"
+            print(
+                f"{name:<32} {row['units']:>10} {row['seconds']:>9.3f} "
+                f"{rate:>20} {row['peak_rss_kb'] / 1024:>8.1f}MB"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for utils.clean_command_string on prefix-heavy commands.
+
+Compares the single-pass scanner with the previous fixed-point
+implementation, kept here as the reference baseline.
+
+Usage: python benchmarks/bench_clean_command.py [--number N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.utils import clean_command_string  # noqa: E402
+
+COMMANDS = [
+    "/bin/ls",
+    "NOPASSWD: /usr/bin/systemctl restart nginx",
+    "(root:wheel) NOPASSWD: SETENV: sha224:0GomF8mNN3wlDt1HD9XldjJ3SNgpFdbjO1+NsQ== /bin/x",
+    "(ALL) (ALL) EXEC: NOPASSWD: !requiretty !visiblepw env_reset=true /bin/ls -l",
+    "(app, www-data) NOEXEC: NOLOG_INPUT: NOLOG_OUTPUT: MAIL: /opt/app/bin/deploy --now",
+]
+
+
+def legacy_clean_command_string(command_part: str) -> str:
+    clean_command_part = command_part.strip()
+    while True:
+        original = clean_command_part
+        clean_command_part = re.sub(r"^\([\w\:\.\-,\s]+\)\s+", "", clean_command_part)
+        clean_command_part = re.sub(r"^[A-Z_]+:\s*", "", clean_command_part)
+        clean_command_part = re.sub(r"^\![\w]+(?:$|\s+)", "", clean_command_part)
+        clean_command_part = re.sub(r"^\w+=\w+(?:$|\s+)", "", clean_command_part)
+        clean_command_part = re.sub(
+            r"^[a-z0-9]+:[a-zA-Z0-9+/=]+\s+", "", clean_command_part
+        )
+        if clean_command_part == original:
+            break
+    return clean_command_part
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'command':<60} {'legacy us':>10} {'scanner us':>10} {'speedup':>8}")
+    for command in COMMANDS:
+        assert clean_command_string(command) == legacy_clean_command_string(command)
+        legacy = timeit.timeit(
+            lambda c=command: legacy_clean_command_string(c), number=args.number
+        )
+        scanner = timeit.timeit(
+            lambda c=command: clean_command_string(c), number=args.number
+        )
+        print(
+            f"{command[:60]:<60} {legacy / args.number * 1e6:>10.2f} "
+            f"{scanner / args.number * 1e6:>10.2f} {legacy / scanner:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
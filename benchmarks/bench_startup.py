@@ -0,0 +1,145 @@
+"""
+Startup benchmark for the sudoers-audit CLI.
+
+Times `import sudoers_audit.cli` (from -X importtime) and a complete
+stdout audit of a one-line sudoers file, each against a bare interpreter
+start, and lists the modules the CLI should not load up front. Exits
+non-zero when the import exceeds the budget or pulls in one of them.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import time allowed for sudoers_audit.cli, best of several runs
+IMPORT_BUDGET_MS = 50.0
+
+# Modules that only some runs need (report writers, archives, includes,
+# process and thread pools, profiling, rule data), and so must not load at
+# import
+LAZY_MODULES = (
+    "sudoers_audit.reporting",
+    "sudoers_audit.profiling",
+    "sudoers_audit.data",
+    "sudoers_audit.cache",
+    "sudoers_audit.watch",
+    "sudoers_audit.includes",
+    "csv",
+    "html",
+    "datetime",
+    "tarfile",
+    "zipfile",
+    "concurrent.futures",
+    "multiprocessing",
+    "hashlib",
+    "socket",
+)
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$")
+
+
+def _python(*args: str, **kwargs) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        **kwargs,
+    )
+
+
+def import_time_ms(module: str = "sudoers_audit.cli") -> float:
+    """
+    Cumulative import time of a module in a fresh interpreter, as reported
+    by -X importtime.
+    """
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def loaded_modules(code: str = "import sudoers_audit.cli") -> set[str]:
+    """
+    Names in sys.modules after running code in a fresh interpreter.
+    """
+    stdout = _python("-c", f"{code}\nimport sys\nprint('\\n'.join(sys.modules))").stdout
+    return set(stdout.split())
+
+
+def eager_modules(
+    code: str = "import sudoers_audit.cli", allowed: tuple[str, ...] = ()
+) -> list[str]:
+    """
+    The LAZY_MODULES, other than `allowed`, that running code loads.
+    """
+    modules = loaded_modules(code)
+    return [name for name in LAZY_MODULES if name in modules and name not in allowed]
+
+
+def _wall_ms(*args: str) -> float:
+    start = time.perf_counter()
+    _python(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first run is not an outlier
+    _python("-c", "import sudoers_audit.cli")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sudoers = os.path.join(tmp, "sudoers")
+        with open(sudoers, "w", encoding="utf-8") as f:
+            f.write("deploy ALL=(root) NOPASSWD: /usr/bin/systemctl restart app\n")
+
+        timings = {
+            "interpreter (python -c pass)": [
+                _wall_ms("-c", "pass") for _ in range(args.runs)
+            ],
+            "import sudoers_audit.cli": [import_time_ms() for _ in range(args.runs)],
+            "stdout audit of one file": [
+                _wall_ms("-m", "sudoers_audit", sudoers) for _ in range(args.runs)
+            ],
+        }
+        eager = eager_modules(
+            f"import sys\nsys.argv = ['sudoers-audit', {sudoers!r}]\n"
+            "from sudoers_audit.cli import main\nmain()",
+            # Auditing a user specification needs the GTFOBins data
+            allowed=("sudoers_audit.data",),
+        )
+
+    print(f"{'measurement':<32} {'best ms':>9} {'median ms':>10}")
+    for name, samples in timings.items():
+        samples.sort()
+        print(f"{name:<32} {samples[0]:>9.1f} {samples[len(samples) // 2]:>10.1f}")
+
+    best_import = timings["import sudoers_audit.cli"][0]
+    failed = False
+    if best_import > args.budget_ms:
+        print(f"FAIL: import takes {best_import:.1f} ms, budget {args.budget_ms} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: loaded by a stdout audit: {', '.join(eager)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Deterministic generator of realistic sudoers corpora for benchmarking.
+"""
+
+import os
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+SAFE_COMMANDS = [
+    "/usr/bin/systemctl restart {svc}",
+    "/usr/bin/systemctl status {svc}",
+    "/usr/sbin/service {svc} reload",
+    "/usr/bin/journalctl -u {svc}",
+    "/usr/bin/ls /var/log/{svc}",
+    "/usr/bin/tail -f /var/log/{svc}.log",
+    "/usr/local/bin/deploy-{svc} --now",
+    "/opt/{svc}/bin/rotate",
+]
+
+RISKY_COMMANDS = [
+    "/usr/bin/vim /etc/{svc}.conf",
+    "/bin/bash",
+    "/usr/bin/find /srv/{svc} -name *.log",
+    "/usr/bin/python3 /opt/{svc}/manage.py",
+    "/usr/bin/less /var/log/{svc}.log",
+    "/usr/bin/cp -r /tmp/{svc} /srv/{svc}",
+    "/usr/bin/chown -R {svc} /srv/{svc}",
+    "/usr/bin/*",
+    "{svc}-helper",
+]
+
+TAGS = ["NOPASSWD:", "PASSWD:", "SETENV:", "NOEXEC:", "EXEC:", "LOG_INPUT:"]
+
+RUNAS = ["(root)", "(ALL)", "(ALL:ALL)", "({svc})", "(root:wheel)", "(app, www-data)"]
+
+DEFAULTS = [
+    "Defaults env_reset",
+    "Defaults mail_badpass",
+    'Defaults secure_path="/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin"',
+    "Defaults use_pty",
+    "Defaults logfile=/var/log/sudo.log",
+    "Defaults:%{group} !requiretty",
+    "Defaults !use_pty, visiblepw",
+    'Defaults env_keep += "LD_PRELOAD PYTHONPATH"',
+    "Defaults:{user} !authenticate",
+]
+
+
+@dataclass
+class CorpusSpec:
+    """
+    Shape of a generated corpus. Ratios are per generated line.
+    """
+
+    seed: int = 1
+    users: int = 200
+    services: int = 50
+    aliases: float = 0.05
+    defaults: float = 0.05
+    includes: float = 0.005
+    comments: float = 0.1
+    tags: float = 0.4
+    gtfobins: float = 0.1
+    commands_per_rule: int = 3
+    file_size: int = 64 * 1024
+
+
+class CorpusGenerator:
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.rnd = random.Random(spec.seed)
+
+    def _fill(self, template: str) -> str:
+        rnd = self.rnd
+        return template.format(
+            svc=f"svc{rnd.randrange(self.spec.services)}",
+            user=f"user{rnd.randrange(self.spec.users)}",
+            group=f"group{rnd.randrange(max(1, self.spec.users // 10))}",
+        )
+
+    def _command(self) -> str:
+        rnd = self.rnd
+        pool = RISKY_COMMANDS if rnd.random() < self.spec.gtfobins else SAFE_COMMANDS
+        return self._fill(rnd.choice(pool))
+
+    def _commands(self) -> str:
+        count = self.rnd.randint(1, self.spec.commands_per_rule)
+        return ", ".join(self._command() for _ in range(count))
+
+    def _user_spec(self) -> str:
+        rnd = self.rnd
+        who = (
+            f"%group{rnd.randrange(max(1, self.spec.users // 10))}"
+            if rnd.random() < 0.2
+            else f"user{rnd.randrange(self.spec.users)}"
+        )
+        prefix = self._fill(rnd.choice(RUNAS)) + " "
+        if rnd.random() < self.spec.tags:
+            prefix += " ".join(rnd.sample(TAGS, rnd.randint(1, 2))) + " "
+        host = rnd.choice(["ALL", "web01", "db01"])
+        commands = "ALL" if rnd.random() < 0.02 else self._commands()
+        return f"{who} {host}={prefix}{commands}"
+
+    def _alias(self) -> str:
+        rnd = self.rnd
+        n = rnd.randrange(1000)
+        kind = rnd.choice(["User_Alias", "Cmnd_Alias", "Host_Alias", "Runas_Alias"])
+        if kind == "Cmnd_Alias":
+            return f"Cmnd_Alias CMDS_{n} = {self._commands()}"
+        if kind == "Host_Alias":
+            return f"Host_Alias HOSTS_{n} = web{n:02d}, db{n:02d}"
+        members = ", ".join(
+            f"user{rnd.randrange(self.spec.users)}" for _ in range(rnd.randint(1, 4))
+        )
+        name = "USERS" if kind == "User_Alias" else "RUNAS"
+        return f"{kind} {name}_{n} = {members}"
+
+    def line(self) -> str:
+        spec = self.spec
+        roll = self.rnd.random()
+        if roll < spec.comments:
+            return "# generated rule"
+        roll -= spec.comments
+        if roll < spec.defaults:
+            return self._fill(self.rnd.choice(DEFAULTS))
+        roll -= spec.defaults
+        if roll < spec.aliases:
+            return self._alias()
+        roll -= spec.aliases
+        if roll < spec.includes:
+            return self.rnd.choice(
+                ["@includedir /etc/sudoers.d", "#include /etc/sudoers.local"]
+            )
+        return self._user_spec()
+
+    def lines(self, size: int) -> Iterator[str]:
+        """
+        Yield lines until about `size` bytes have been produced.
+        """
+        produced = 0
+        while produced < size:
+            line = self.line()
+            produced += len(line) + 1
+            yield line
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size such as '512', '64K', '10M' or '1G' into bytes.
+    """
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    value = value.strip().upper().removesuffix("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def generate_corpus(root: str, size: int, spec: CorpusSpec | None = None) -> list[str]:
+    """
+    Write a sudoers tree of about `size` bytes under root: a main `sudoers`
+    file plus `sudoers.d/` fragments of spec.file_size bytes each.
+    Returns the generated file paths. The same spec always yields the
+    same bytes.
+    """
+    spec = spec or CorpusSpec()
+    generator = CorpusGenerator(spec)
+    os.makedirs(os.path.join(root, "sudoers.d"), exist_ok=True)
+
+    paths = []
+    remaining = size
+    index = 0
+    while remaining > 0:
+        chunk = min(spec.file_size, remaining)
+        if index == 0:
+            path = os.path.join(root, "sudoers")
+        else:
+            path = os.path.join(root, "sudoers.d", f"{index:06d}-generated")
+        with open(path, "w", encoding="utf-8") as f:
+            for line in generator.lines(chunk):
+                f.write(line + "\n")
+        paths.append(path)
+        remaining -= os.path.getsize(path)
+        index += 1
+    return paths
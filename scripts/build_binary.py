@@ -1,3 +1,6 @@
+import os
+import sys
+
 import PyInstaller.__main__
 from pathlib import Path
 
@@ -9,6 +12,13 @@ def build():
 
     print(f"Building from root: {project_root}")
 
+    # Prebuild the rule database so the binary does not derive it on every run
+    sys.path.insert(0, str(src_path))
+    from sudoers_audit.ruledb import write_ruledb
+
+    ruledb_path = write_ruledb()
+    print(f"Rule database written to {ruledb_path}")
+
     # Define PyInstaller arguments
     # Use the shim entry point to ensure package context is preserved
     entry_point = project_root / "scripts" / "entry_point.py"
@@ -21,6 +31,8 @@ def build():
         "--clean",  # Clean cache
         "--paths",
         str(src_path),  # Add src to path
+        "--add-data",
+        f"{ruledb_path}{os.pathsep}sudoers_audit",  # Prebuilt rule database
         "--distpath",
         str(project_root / "dist"),  # Output directory
         "--workpath",
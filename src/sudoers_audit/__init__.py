@@ -1,3 +1,20 @@
-from .auditor import SudoersAuditor
+# Submodules load on first use: the console script imports
+# sudoers_audit.cli, which should not pay for the auditor and its rules
+# before it has parsed its arguments
+_EXPORTS = {
+    "SudoersAuditor": "auditor",
+    "LineKind": "parser",
+    "ParsedLine": "parser",
+    "parse_line": "parser",
+}
 
-__all__ = ["SudoersAuditor"]
+__all__ = ["SudoersAuditor", "LineKind", "ParsedLine", "parse_line"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(f".{module}", __name__), name)
@@ -0,0 +1,150 @@
+import re
+from collections.abc import Iterable
+
+from .parser import (
+    LineKind,
+    ParsedLine,
+    classify_line,
+    is_alias_name,
+    iter_logical_lines,
+    parse_line,
+)
+from .utils import split_sudoers_commands
+
+CMND_ALIAS = "Cmnd_Alias"
+
+# Cmd_Alias is an accepted spelling of Cmnd_Alias
+_CANONICAL_TYPES = {"Cmd_Alias": CMND_ALIAS}
+
+# Several definitions may share a line: `Cmnd_Alias A = /x : B = /y`
+_DEFINITION_SPLIT_RE = re.compile(r"\s*:\s*(?=[A-Z][A-Z0-9_]*\s*=)")
+_DEFINITION_RE = re.compile(r"([A-Z][A-Z0-9_]*)\s*=")
+
+
+def command_alias_refs(parsed: ParsedLine) -> list[str]:
+    """
+    Names of the aliases a user specification or Cmnd_Alias definition
+    lists in place of commands. Negated references are exclusions and are
+    not returned.
+    """
+    if parsed.kind is LineKind.ALIAS:
+        if _CANONICAL_TYPES.get(parsed.alias_type, parsed.alias_type) != CMND_ALIAS:
+            return []
+    elif parsed.kind is not LineKind.USER_SPEC:
+        return []
+    refs = (argv[0] for argv in parsed.argv if len(argv) == 1)
+    return list(dict.fromkeys(ref for ref in refs if is_alias_name(ref)))
+
+
+class AliasTable:
+    """
+    Symbol table of the User_Alias, Runas_Alias, Host_Alias and Cmnd_Alias
+    definitions seen during one audit.
+
+    References are only resolved on expansion, so aliases may be nested and
+    used before they are defined. Complete expansions, and which aliases
+    are complete, are memoized per alias; a cycle expands each alias at
+    most once.
+    """
+
+    def __init__(self):
+        self._members: dict[tuple[str, str], tuple[str, ...]] = {}
+        self._expanded: dict[tuple[str, str], tuple[str, ...]] = {}
+        # Aliases whose nested aliases are all defined
+        self._complete: set[tuple[str, str]] = set()
+
+    @staticmethod
+    def _key(alias_type: str, name: str) -> tuple[str, str]:
+        return _CANONICAL_TYPES.get(alias_type, alias_type), name
+
+    def define(self, alias_type: str, name: str, members: list[str]):
+        # sudo rejects duplicate definitions; keep the first one
+        self._members.setdefault(self._key(alias_type, name), tuple(members))
+
+    def define_line(self, parsed: ParsedLine) -> list[str]:
+        """
+        Record every alias defined on a parsed alias line, and return
+        their names.
+        """
+        if parsed.kind is not LineKind.ALIAS or parsed.alias_type is None:
+            return []
+        names = []
+        body = parsed.text[len(parsed.alias_type) :].strip()
+        for definition in _DEFINITION_SPLIT_RE.split(body):
+            match = _DEFINITION_RE.match(definition)
+            if match:
+                names.append(match.group(1))
+                self.define(
+                    parsed.alias_type,
+                    match.group(1),
+                    split_sudoers_commands(definition),
+                )
+        return names
+
+    def define_all(self, lines: Iterable[str]):
+        """
+        Record the aliases defined anywhere in a file, without auditing it.
+        """
+        for _start, _end, line in iter_logical_lines(lines):
+            text = line.strip()
+            if classify_line(text) is LineKind.ALIAS:
+                self.define_line(parse_line(text))
+
+    def is_defined(self, alias_type: str, name: str) -> bool:
+        return self._key(alias_type, name) in self._members
+
+    def missing(self, alias_type: str, name: str) -> set[str]:
+        """
+        Names of the aliases reachable from `name`, itself included, that
+        have not been defined yet.
+        """
+        alias_type = self._key(alias_type, name)[0]
+        missing: set[str] = set()
+        seen: set[str] = set()
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            if current in seen or (alias_type, current) in self._complete:
+                continue
+            seen.add(current)
+            members = self._members.get((alias_type, current))
+            if members is None:
+                missing.add(current)
+            else:
+                stack.extend(m for m in members if is_alias_name(m))
+        if not missing:
+            # Definitions are never replaced, so complete aliases stay so
+            self._complete.update((alias_type, current) for current in seen)
+        return missing
+
+    def expand(self, alias_type: str, name: str) -> tuple[str, ...]:
+        """
+        Members of an alias with nested aliases replaced by their members,
+        in definition order and without duplicates. Negated members are
+        exclusions rather than grants and are left out; undefined aliases
+        expand to nothing.
+        """
+        key = self._key(alias_type, name)
+        expanded = self._expanded.get(key)
+        if expanded is None:
+            expanded = tuple(dict.fromkeys(self._expand(key, set())))
+            # Later definitions could still change an incomplete expansion
+            if not self.missing(*key):
+                self._expanded[key] = expanded
+        return expanded
+
+    def _expand(self, key: tuple[str, str], active: set[str]) -> list[str]:
+        if key in self._expanded:
+            return list(self._expanded[key])
+        active.add(key[1])
+        result: list[str] = []
+        for member in self._members.get(key, ()):
+            if member.startswith("!"):
+                continue
+            if is_alias_name(member):
+                if member not in active:
+                    result.extend(self._expand((key[0], member), active))
+            else:
+                result.append(member)
+        active.discard(key[1])
+        return result
@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+
+ARCHIVE_SUFFIXES = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.xz",
+    ".txz",
+    ".tar.bz2",
+    ".tbz2",
+    ".zip",
+)
+
+# Members above this size are reported instead of being read into memory
+MAX_MEMBER_SIZE = 64 * 1024 * 1024
+
+
+def is_archive(path: str) -> bool:
+    """
+    Whether a path names a supported tar or zip archive, judged by suffix.
+    """
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_path(archive: str, member: str) -> str:
+    """
+    Path under which findings for an archive member are reported.
+    """
+    return f"{archive}!{member}"
+
+
+def iter_archive_members(path: str) -> Iterator[tuple[str, bytes | None]]:
+    """
+    Yield (member name, content) for each regular file in an archive, in
+    archive order. Contents are streamed into memory and never extracted
+    to disk. Members larger than MAX_MEMBER_SIZE yield None as content.
+    """
+    # Imported here so that runs without archives do not pay for them
+    import tarfile
+    import zipfile
+
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as member:
+                    data = member.read(MAX_MEMBER_SIZE + 1)
+                yield info.filename, data if len(data) <= MAX_MEMBER_SIZE else None
+        return
+
+    # Stream mode reads the (possibly compressed) archive front to back once
+    with tarfile.open(path, "r|*") as archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            if info.size > MAX_MEMBER_SIZE:
+                yield info.name, None
+                continue
+            yield info.name, archive.extractfile(info).read()
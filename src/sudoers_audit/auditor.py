@@ -1,14 +1,34 @@
+import functools
+import io
 import os
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
+from .aliases import CMND_ALIAS, AliasTable, command_alias_refs
+from .issues import Issue, Severity
+from .parser import ParsedLine, iter_logical_lines, parse_line
 from .rules import get_all_rules, get_all_path_rules
-from .utils import clean_command_string, split_sudoers_commands
+from .rules.commands import relative_path_issue
+from .rules.dispatch import RuleDispatcher
+from .statcache import DEFAULT_STAT_THREADS, StatCache
+
+# Distinct stripped lines whose analysis is memoized per auditor
+DEFAULT_LINE_CACHE_SIZE = 4096
+
+# Findings held back at once while waiting for a Cmnd_Alias definition
+MAX_HELD_FINDINGS = 1024
+
+# Logical lines whose referenced paths are stat'ed together, concurrently,
+# before their permission checks run
+PREFETCH_BATCH = 512
 
 
 @dataclass
 class Finding:
     line_number: int
     line_content: str
-    issues: list[str]
+    issues: list[Issue]
+    # Last physical line of a backslash-continued line
+    end_line_number: int | None = None
 
 
 @dataclass
@@ -23,27 +43,76 @@ class SudoersAuditor:
     Auditor for sudoers files to detect security risks.
     """
 
-    def __init__(self):
+    # Kept as an attribute so a profiler can swap in a timed version
+    parse_line = staticmethod(parse_line)
+
+    def __init__(
+        self,
+        line_cache_size: int = DEFAULT_LINE_CACHE_SIZE,
+        stat_threads: int = DEFAULT_STAT_THREADS,
+        stat_scandir: bool = False,
+    ):
         self.rules = get_all_rules()
-        self.path_rules = get_all_path_rules()
+        self.stat_cache = StatCache(threads=stat_threads, scandir=stat_scandir)
+        self.path_rules = get_all_path_rules(self.stat_cache)
+        self.dispatcher = RuleDispatcher(self.rules)
+        self.alias_dispatcher = self.expansion_dispatcher(self.rules)
+        self.line_cache_size = line_cache_size
+        # Identical lines recur across files of a fleet; a size of 0 disables
+        # the memo. Host-dependent permission checks are never memoized.
+        self._analyze = (
+            functools.lru_cache(maxsize=line_cache_size)(self._analyze_text)
+            if line_cache_size > 0
+            else self._analyze_text
+        )
 
-    def analyze_line(self, line_num: int, line: str) -> list[str]:
+    @staticmethod
+    def expansion_dispatcher(rules: Iterable) -> RuleDispatcher:
         """
-        Analyze a single line for security issues.
+        Dispatcher over the rules that also evaluate the commands that
+        Cmnd_Alias references expand to.
         """
-        issues = []
-        line = line.strip()
+        return RuleDispatcher(r for r in rules if getattr(r, "expands_aliases", False))
+
+    def _analyze_text(self, text: str) -> tuple[ParsedLine, tuple[Issue, ...]]:
+        parsed = self.parse_line(text)
+        return parsed, tuple(self.analyze_parsed(parsed))
 
-        # Skip comments and empty lines
-        if not line or line.startswith("#"):
-            return issues
+    def line_cache_info(self) -> dict:
+        """
+        Hit and miss counts of the analyze_line memo.
+        """
+        cache_info = getattr(self._analyze, "cache_info", None)
+        if cache_info is None:
+            return {"hits": 0, "misses": 0, "size": 0, "maxsize": 0, "hit_rate": 0.0}
+        info = cache_info()
+        calls = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / calls if calls else 0.0,
+        }
 
-        for rule in self.rules:
-            issues.extend(rule.check(line))
+    def analyze_line(self, line_num: int, line: str) -> list[Issue]:
+        """
+        Analyze a single line for security issues.
+        Results are memoized by the stripped line text.
+        """
+        return list(self._analyze(line.strip())[1])
 
+    def analyze_parsed(self, parsed: ParsedLine) -> list[Issue]:
+        """
+        Run the rules registered for the line's kind against a parsed line.
+        Comments, empty lines and include directives have no rules.
+        """
+        issues = []
+        for check in self.dispatcher.checks_for(parsed):
+            issues.extend(check(parsed))
         return issues
 
-    def check_file_permissions(self, path: str) -> list[str]:
+    def check_file_permissions(self, path: str) -> list[Issue]:
         """
         Check file system permissions for a given path.
         """
@@ -52,64 +121,268 @@ class SudoersAuditor:
             if not os.path.isabs(path):
                 return issues
 
-            if not os.path.exists(path):
+            # One cached stat call covers both existence and metadata
+            st = self.stat_cache.stat(path)
+            if st is None:
                 issues.append(
-                    f"LOW: Referenced file '{path}' not found on this system."
+                    Issue(
+                        Severity.LOW,
+                        "SUDO019",
+                        "Referenced file '{}' not found on this system.",
+                        (path,),
+                    )
                 )
                 return issues
 
-            st = os.stat(path)
             for rule in self.path_rules:
                 issues.extend(rule.check_path(path, stat_info=st))
 
         except OSError as e:
-            issues.append(f"WARNING: Could not check permissions for '{path}': {e}")
+            issues.append(
+                Issue(
+                    Severity.WARNING,
+                    "SUDO020",
+                    "Could not check permissions for '{}': {}",
+                    (path, str(e)),
+                )
+            )
 
         return issues
 
+    @staticmethod
+    def _binaries(parsed: ParsedLine) -> list[str]:
+        # Take the first token of each command as the binary
+        return [argv[0] for argv in parsed.argv if argv and argv[0].startswith("/")]
+
+    def _permission_issues(self, parsed: ParsedLine) -> list[Issue]:
+        issues = []
+        for binary in self._binaries(parsed):
+            issues.extend(self.check_file_permissions(binary))
+        return issues
+
+    def _analyzed_lines(
+        self, lines: Iterable[str], check_permissions: bool
+    ) -> Iterator[tuple[int, int, ParsedLine, tuple[Issue, ...]]]:
+        """
+        Yield (start, end, parsed, issues) for each logical line. With
+        permission checks, lines are analyzed a batch ahead and the binaries
+        they reference, with their parent directories, are prefetched together
+        by the stat cache (see StatCache.prefetch), so that the checks find
+        them cached.
+        """
+        analyzed = (
+            (start, end, *self._analyze(line.strip()))
+            for start, end, line in iter_logical_lines(lines)
+        )
+        if not check_permissions or not self.stat_cache.prefetches:
+            yield from analyzed
+            return
+
+        # Batches are also cut so that their paths fit in the stat cache;
+        # otherwise prefetched entries are evicted before their checks run
+        limit = self.stat_cache.maxsize
+        batch: list[tuple[int, int, ParsedLine, tuple[Issue, ...]]] = []
+        paths: dict[str, None] = {}
+        for item in analyzed:
+            binaries = self._binaries(item[2])
+            item_paths = [*binaries, *(os.path.dirname(b) for b in binaries)]
+            if batch and (
+                len(batch) == PREFETCH_BATCH or len(paths) + len(item_paths) > limit
+            ):
+                self.stat_cache.prefetch(paths)
+                yield from batch
+                batch, paths = [], {}
+            batch.append(item)
+            paths.update(dict.fromkeys(item_paths))
+        if batch:
+            self.stat_cache.prefetch(paths)
+            yield from batch
+
+    def _alias_issues(
+        self, table: AliasTable, name: str, check_permissions: bool
+    ) -> list[tuple[Issue, Issue]]:
+        """
+        Issues of the commands a Cmnd_Alias expands to, each paired with
+        its copy attributed to the alias.
+        """
+        commands = table.expand(CMND_ALIAS, name)
+        if not commands:
+            return []
+        parsed = self.parse_line(f"{CMND_ALIAS} {name} = {', '.join(commands)}")
+        issues = []
+        for check in self.alias_dispatcher.checks_for(parsed):
+            issues.extend(check(parsed))
+        if check_permissions:
+            issues.extend(self._permission_issues(parsed))
+        origin = f"{CMND_ALIAS} {name}"
+        return [(issue, issue.via(origin)) for issue in dict.fromkeys(issues)]
+
+    def iter_line_findings(
+        self,
+        lines: Iterable[str],
+        check_permissions: bool = False,
+        aliases: AliasTable | None = None,
+    ) -> Iterator[Finding]:
+        """
+        Yield a Finding for every line with issues, as each line is processed.
+        Backslash-continued lines are joined and analyzed once; the finding
+        spans their first to last physical line.
+
+        Lines that use a Cmnd_Alias also get the issues of the commands it
+        expands to, evaluated once per alias. A line using an alias that is
+        not defined yet is held back until the alias is defined, so it may
+        be yielded after later lines. At most MAX_HELD_FINDINGS are held; the
+        oldest beyond that, and all still held when the input ends, are
+        yielded with their undefined aliases reported as relative paths.
+        Passing a shared `aliases` table lets the files of one policy use
+        each other's aliases.
+        """
+        table = aliases if aliases is not None else AliasTable()
+        alias_issues: dict[str, list[tuple[Issue, Issue]]] = {}
+        # Held findings by line order, and the held lines each undefined
+        # alias name is awaited by
+        held: dict[int, tuple[Finding, list[str]]] = {}
+        waiting: dict[str, set[int]] = {}
+
+        def missing(refs: list[str]) -> set[str]:
+            # Aliases with memoized issues are known to be complete
+            return set().union(
+                *(
+                    table.missing(CMND_ALIAS, ref)
+                    for ref in refs
+                    if ref not in alias_issues
+                )
+            )
+
+        def complete(finding: Finding, refs: list[str]) -> Iterator[Finding]:
+            # An issue the line already has, directly or through another
+            # alias (e.g. in a cycle), is not reported again
+            seen = set(finding.issues)
+            for ref in refs:
+                if not table.is_defined(CMND_ALIAS, ref):
+                    finding.issues.append(relative_path_issue(ref))
+                    continue
+                issues = alias_issues.get(ref)
+                if issues is None:
+                    issues = self._alias_issues(table, ref, check_permissions)
+                    # Expansions still missing nested aliases may yet change
+                    if not table.missing(CMND_ALIAS, ref):
+                        alias_issues[ref] = issues
+                for issue, attributed in issues:
+                    if issue not in seen:
+                        seen.add(issue)
+                        finding.issues.append(attributed)
+            if finding.issues:
+                yield finding
+
+        def hold(key: int, names: set[str]):
+            for name in names:
+                waiting.setdefault(name, set()).add(key)
+
+        for start, end, parsed, line_issues in self._analyzed_lines(
+            lines, check_permissions
+        ):
+            issues = list(line_issues)
+            defined = table.define_line(parsed)
+
+            if check_permissions:
+                issues.extend(self._permission_issues(parsed))
+
+            finding = Finding(
+                line_number=start,
+                line_content=parsed.text,
+                issues=issues,
+                end_line_number=end,
+            )
+            refs = command_alias_refs(parsed)
+            names = missing(refs) if refs else None
+            if names:
+                held[start] = (finding, refs)
+                hold(start, names)
+                if len(held) > MAX_HELD_FINDINGS:
+                    yield from complete(*held.pop(next(iter(held))))
+            elif refs:
+                yield from complete(finding, refs)
+            elif issues:
+                yield finding
+
+            # Release the held lines that this line's definitions complete
+            for name in defined:
+                for key in sorted(waiting.pop(name, ())):
+                    if key not in held:
+                        continue
+                    names = missing(held[key][1])
+                    if names:
+                        hold(key, names)
+                    else:
+                        yield from complete(*held.pop(key))
+
+        for entry in held.values():
+            yield from complete(*entry)
+
+    def iter_findings(
+        self, filepath: str, check_permissions: bool = False
+    ) -> Iterator[Finding]:
+        """
+        Audit a file incrementally, yielding findings as they are produced.
+        The file is read line by line, so memory stays flat on large files.
+        Errors opening or reading the file are raised to the caller.
+        """
+        with open(filepath, "r") as f:
+            yield from self.iter_line_findings(f, check_permissions)
+
     def audit_file(
         self, filepath: str, check_permissions: bool = False
     ) -> FileAuditResult:
         """
         Audit a specific file and return findings.
         """
-        result = FileAuditResult(file_path=filepath)
+        return self._collect(
+            filepath, lambda: self.iter_findings(filepath, check_permissions)
+        )
+
+    def audit_bytes(
+        self,
+        name: str,
+        data: bytes,
+        check_permissions: bool = False,
+        aliases: AliasTable | None = None,
+    ) -> FileAuditResult:
+        """
+        Audit file content already held in memory, decoded the same way as
+        audit_file reads files from disk. Findings are reported under `name`.
+        """
+        return self._collect(
+            name,
+            lambda: self.iter_line_findings(
+                io.TextIOWrapper(io.BytesIO(data)), check_permissions, aliases
+            ),
+        )
+
+    @staticmethod
+    def _collect(
+        name: str, findings: Callable[[], Iterable[Finding]]
+    ) -> FileAuditResult:
+        result = FileAuditResult(file_path=name)
 
         try:
-            with open(filepath, "r") as f:
-                lines = f.readlines()
-
-            for i, line in enumerate(lines):
-                # Handle continued lines (trailing \)
-                if line.strip().endswith("\\"):
-                    pass
-
-                issues = self.analyze_line(i + 1, line)
-
-                if check_permissions and "=" in line:
-                    # Extract command paths
-                    commands = split_sudoers_commands(line)
-                    for cmd_part in commands:
-                        cleaned_cmd = clean_command_string(cmd_part)
-                        # Take the first token as the binary
-                        cmd_path = cleaned_cmd.split(" ")[0]
-
-                        if cmd_path.startswith("/"):
-                            perm_issues = self.check_file_permissions(cmd_path)
-                            issues.extend(perm_issues)
-
-                if issues:
-                    result.findings.append(
-                        Finding(
-                            line_number=i + 1, line_content=line.strip(), issues=issues
-                        )
-                    )
+            for finding in findings():
+                result.findings.append(finding)
+            # Findings held for a later alias definition arrive out of order
+            result.findings.sort(key=lambda finding: finding.line_number)
 
-        except PermissionError:
-            result.error = "Permission denied. Run with sudo?"
-        except FileNotFoundError:
-            result.error = "File not found."
         except Exception as e:
-            result.error = f"Error reading file: {str(e)}"
+            result.error = SudoersAuditor.read_error(e)
 
         return result
+
+    @staticmethod
+    def read_error(e: Exception) -> str:
+        """
+        Message reported for a file whose audit failed with `e`.
+        """
+        if isinstance(e, PermissionError):
+            return "Permission denied. Run with sudo?"
+        if isinstance(e, FileNotFoundError):
+            return "File not found."
+        return f"Error reading file: {str(e)}"
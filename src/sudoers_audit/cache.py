@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import time
+from functools import cache
+
+from .auditor import FileAuditResult, Finding
+from .issues import Issue, Severity
+
+# Bump when the on-disk entry layout changes
+CACHE_FORMAT = 3
+
+# Files modified this recently may still change within the same mtime tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@cache
+def rules_fingerprint() -> str:
+    """
+    Version fingerprint of everything that determines audit findings: every
+    module of the package plus the RISKY_BINARIES data. Any change
+    to them yields a new fingerprint and invalidates existing cache entries.
+    """
+    from . import data
+
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT}".encode())
+    digest.update(json.dumps(sorted(data.RISKY_BINARIES.items())).encode())
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = sorted(
+        os.path.relpath(os.path.join(root, name), package_dir)
+        for root, _, names in os.walk(package_dir)
+        for name in names
+        if name.endswith(".py")
+    )
+    for source in sources:
+        digest.update(source.encode())
+        try:
+            with open(os.path.join(package_dir, source), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            # Frozen builds ship no sources; the data hash still applies
+            pass
+    return digest.hexdigest()
+
+
+def _result_to_dict(result: FileAuditResult) -> dict:
+    return {
+        "findings": [
+            {
+                "line_number": finding.line_number,
+                "line_content": finding.line_content,
+                "issues": [
+                    [i.severity.value, i.rule_id, i.template, list(i.params)]
+                    for i in finding.issues
+                ],
+                "end_line_number": finding.end_line_number,
+            }
+            for finding in result.findings
+        ],
+    }
+
+
+def _result_from_dict(file_path: str, data: dict) -> FileAuditResult:
+    return FileAuditResult(
+        file_path=file_path,
+        findings=[
+            Finding(
+                line_number=finding["line_number"],
+                line_content=finding["line_content"],
+                issues=[
+                    Issue(Severity(severity), rule_id, template, tuple(params))
+                    for severity, rule_id, template, params in finding["issues"]
+                ],
+                end_line_number=finding["end_line_number"],
+            )
+            for finding in data["findings"]
+        ],
+    )
+
+
+class AuditCache:
+    """
+    Persistent cache of FileAuditResults, one JSON entry per audited path.
+
+    An entry is reused when the file's size and mtime are unchanged, which
+    costs a single stat. When they differ, the content hash decides: a
+    touched but identical file is still a hit. Entries written under a
+    different rules fingerprint are ignored and overwritten.
+    """
+
+    def __init__(self, cache_dir: str, fingerprint: str | None = None):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint or rules_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, path: str) -> dict | None:
+        try:
+            with open(self._entry_path(path), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("fingerprint") != self.fingerprint:
+            return None
+        if entry.get("path") != os.path.abspath(path):
+            return None
+        return entry
+
+    def _store(self, path: str, st: os.stat_result, digest: str, result: dict):
+        mtime_ns = st.st_mtime_ns
+        if time.time_ns() - mtime_ns < _RACY_WINDOW_NS:
+            # Don't trust the mtime yet; the next run verifies the hash instead
+            mtime_ns = -1
+        entry = {
+            "fingerprint": self.fingerprint,
+            "path": os.path.abspath(path),
+            "size": st.st_size,
+            "mtime_ns": mtime_ns,
+            "sha256": digest,
+            "result": result,
+        }
+        entry_path = self._entry_path(path)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            # Atomic so that concurrent workers never read a partial entry
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def audit(self, auditor, path: str) -> FileAuditResult:
+        """
+        Return the cached result for path, auditing it on a cache miss.
+        Results with read errors are never cached.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return auditor.audit_file(path)
+
+        entry = self._load(path)
+        if (
+            entry is not None
+            and entry["size"] == st.st_size
+            and entry["mtime_ns"] == st.st_mtime_ns
+        ):
+            self.hits += 1
+            return _result_from_dict(path, entry["result"])
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return auditor.audit_file(path)
+
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is not None and entry["sha256"] == digest:
+            # Touched but unchanged: refresh the metadata and reuse the result
+            self.hits += 1
+            self._store(path, st, digest, entry["result"])
+            return _result_from_dict(path, entry["result"])
+
+        self.misses += 1
+        result = auditor.audit_bytes(path, data)
+        if result.error is None:
+            self._store(path, st, digest, _result_to_dict(result))
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
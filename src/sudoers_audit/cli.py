@@ -1,78 +1,305 @@
 import argparse
 import sys
 import os
-from .auditor import SudoersAuditor, FileAuditResult
-from .reporting import ReportGenerator
+
+# The auditor, runner, report writers, profiling and rule data are imported
+# only when a run needs them: the CLI is often started once per host as a
+# validation hook, where a plain stdout audit of one file should not pay
+# for them.
+
+
+def _exit_on_broken_pipe():
+    """
+    Exit quietly when the reader of stdout went away (e.g. `| head`).
+    stdout is pointed at devnull so the interpreter's final flush does not
+    raise again.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+
+def _write_profile(profiler, args: argparse.Namespace):
+    if args.profile_output:
+        import json
+
+        with open(args.profile_output, "w", encoding="utf-8") as f:
+            json.dump(profiler.to_dict(), f, indent=2)
+    if args.profile:
+        print(profiler.summary_table(), file=sys.stderr)
 
 
 def main():
+    from .auditor import DEFAULT_LINE_CACHE_SIZE, SudoersAuditor
+    from .statcache import DEFAULT_STAT_THREADS
+
     parser = argparse.ArgumentParser(
         description="Audit sudoers files for security risks."
     )
-    parser.add_argument("path", help="Path to the sudoers file or directory to audit")
+    parser.add_argument(
+        "path", help="Path to the sudoers file, tar/zip archive or directory to audit"
+    )
     parser.add_argument(
         "-f",
         "--format",
-        choices=["csv", "html", "sarif"],
+        choices=["csv", "html", "sarif", "jsonl"],
         help="Output format for the report",
     )
-    parser.add_argument("-o", "--output", help="Output file path for the report")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output file path for the report ('-' writes jsonl to stdout, "
+        "the default for jsonl)",
+    )
     parser.add_argument(
         "-p",
         "--check-permissions",
         action="store_true",
         help="Enable filesystem permission checks (requires running on the target system)",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write SARIF reports without pretty-printing (smaller output)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for directory and archive audits (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse results for unchanged files from this persistent cache "
+        "directory (not used with --check-permissions)",
+    )
+    parser.add_argument(
+        "--follow-includes",
+        action="store_true",
+        help="Also audit the files pulled in by @include/@includedir "
+        "(and #include/#includedir) directives, as one policy",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Audit byte-identical files once and reuse the result for every copy",
+    )
+    parser.add_argument(
+        "--line-cache-size",
+        type=int,
+        default=DEFAULT_LINE_CACHE_SIZE,
+        help="Number of distinct lines whose analysis is memoized per worker "
+        f"(default: {DEFAULT_LINE_CACHE_SIZE}, 0 = disabled)",
+    )
+    parser.add_argument(
+        "--stat-threads",
+        type=int,
+        default=DEFAULT_STAT_THREADS,
+        help="Threads that stat referenced binaries ahead of --check-permissions, "
+        "for network filesystems where each stat is a round trip "
+        f"(default: {DEFAULT_STAT_THREADS}, 1 = stat inline)",
+    )
+    parser.add_argument(
+        "--stat-scandir",
+        action="store_true",
+        help="For --check-permissions, list each directory of referenced "
+        "binaries once instead of stat-ing every binary and parent directory",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident and re-audit files as they change, printing new "
+        "and resolved findings as JSON lines",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds for --watch where inotify is "
+        "unavailable (default: 1.0)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-rule and per-file timings to stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Write per-rule and per-file timings as JSON to this file",
+    )
     args = parser.parse_args()
 
-    auditor = SudoersAuditor()
+    if args.watch:
+        # Watch mode streams JSON events from a single in-process session
+        unsupported = [
+            flag
+            for flag, given in (
+                ("--format", args.format),
+                ("--output", args.output),
+                ("--jobs", args.jobs != 1),
+                ("--cache-dir", args.cache_dir),
+                ("--dedupe", args.dedupe),
+                ("--follow-includes", args.follow_includes),
+            )
+            if given
+        ]
+        if unsupported:
+            parser.error(f"--watch cannot be combined with {', '.join(unsupported)}")
+
     target = args.path
-    results: list[FileAuditResult] = []
 
     if not os.path.exists(target):
-        print("ERROR: Target path does not exist.")
+        print("ERROR: Target path does not exist.", file=sys.stderr)
         sys.exit(1)
 
-    if os.path.isdir(target):
-        for root, _, files in os.walk(target):
-            for file in files:
-                results.append(
-                    auditor.audit_file(os.path.join(root, file), args.check_permissions)
-                )
-    else:
-        results.append(auditor.audit_file(target, args.check_permissions))
+    if args.jobs < 0:
+        print("ERROR: --jobs must be zero or a positive integer.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.line_cache_size < 0:
+        print(
+            "ERROR: --line-cache-size must be zero or a positive integer.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if args.stat_threads < 1:
+        print("ERROR: --stat-threads must be a positive integer.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.format == "jsonl" and not args.output:
+        args.output = "-"
+    if args.output == "-" and args.format != "jsonl":
+        print("ERROR: Only the jsonl format can be written to stdout.", file=sys.stderr)
+        sys.exit(1)
+
+    auditor = None
+    profiler = None
+    if args.profile or args.profile_output:
+        # Instrumentation lives in this process, so profiling runs serially
+        if args.jobs != 1:
+            print("WARNING: --profile ignores --jobs.", file=sys.stderr)
+            args.jobs = 1
+        from .profiling import Profiler
+
+        profiler = Profiler()
+        auditor = profiler.instrument(
+            SudoersAuditor(args.line_cache_size, args.stat_threads, args.stat_scandir)
+        )
+
+    if args.watch:
+        from .watch import run_watch
+
+        run_watch(
+            target,
+            auditor
+            or SudoersAuditor(
+                args.line_cache_size, args.stat_threads, args.stat_scandir
+            ),
+            args.check_permissions,
+            args.watch_interval,
+        )
+        # Interrupting the watch ends the run; report what it measured
+        if profiler is not None:
+            _write_profile(profiler, args)
+        return
+
+    if args.follow_includes:
+        # Included files are loaded by threads and audited in order here,
+        # as one policy, neither cached nor deduplicated
+        if args.jobs != 1:
+            print("WARNING: --follow-includes ignores --jobs.", file=sys.stderr)
+            args.jobs = 1
+        if args.cache_dir:
+            print("WARNING: --follow-includes ignores --cache-dir.", file=sys.stderr)
+            args.cache_dir = None
+        if args.dedupe:
+            print("WARNING: --follow-includes ignores --dedupe.", file=sys.stderr)
+            args.dedupe = False
+
+    from .runner import Deduplicator, collect_files, iter_results
+
+    dedupe = Deduplicator() if args.dedupe else None
+
+    # Results are produced lazily so report writers can stream them
+    results = iter_results(
+        collect_files(target),
+        args.check_permissions,
+        args.jobs,
+        auditor,
+        cache_dir=args.cache_dir,
+        dedupe=dedupe,
+        line_cache_size=args.line_cache_size,
+        stat_threads=args.stat_threads,
+        stat_scandir=args.stat_scandir,
+        follow_includes=args.follow_includes,
+        # jsonl records are written one by one as findings are produced;
+        # profiling times whole files, so it keeps per-file results
+        stream=args.format == "jsonl" and profiler is None,
+    )
 
     # Generate Report if requested
     if args.format and args.output:
+        from .reporting import ReportGenerator
+
         try:
             if args.format == "csv":
                 ReportGenerator.generate_csv(results, args.output)
             elif args.format == "html":
                 ReportGenerator.generate_html(results, args.output)
             elif args.format == "sarif":
-                ReportGenerator.generate_sarif(results, args.output)
-            print(f"Report generated successfully: {args.output}")
+                ReportGenerator.generate_sarif(
+                    results, args.output, pretty=not args.compact
+                )
+            elif args.format == "jsonl":
+                ReportGenerator.generate_jsonl(results, args.output)
+            # Keep stdout to the records themselves when streaming there
+            if args.output != "-":
+                print(f"Report generated successfully: {args.output}")
+        except BrokenPipeError:
+            _exit_on_broken_pipe()
         except Exception as e:
-            print(f"ERROR: Failed to generate report: {e}")
+            print(f"ERROR: Failed to generate report: {e}", file=sys.stderr)
             sys.exit(1)
 
     # Default behavior: Print to stdout if no report requested
     elif not args.format:
-        for result in results:
-            print(f"--- Auditing {result.file_path} ---")
-            if result.error:
-                print(f"ERROR: {result.error}")
-            elif result.findings:
-                for finding in result.findings:
-                    print(f"Line {finding.line_number}: {finding.line_content}")
-                    for issue in finding.issues:
-                        print(f"  [!] {issue}")
-                    print("")
+        try:
+            for result in results:
+                print(f"--- Auditing {result.file_path} ---")
+                if result.error:
+                    print(f"ERROR: {result.error}")
+                elif result.findings:
+                    for finding in result.findings:
+                        line, end = finding.line_number, finding.end_line_number
+                        if end and end > line:
+                            print(f"Lines {line}-{end}: {finding.line_content}")
+                        else:
+                            print(f"Line {line}: {finding.line_content}")
+                        for issue in finding.issues:
+                            print(f"  [!] {issue}")
+                        print("")
+        except BrokenPipeError:
+            _exit_on_broken_pipe()
     else:
         if args.format and not args.output:
-            print("ERROR: --output required when --format is specified.")
+            print(
+                "ERROR: --output required when --format is specified.", file=sys.stderr
+            )
             sys.exit(1)
 
+    if dedupe is not None:
+        stats = dedupe.stats()
+        print(
+            f"Deduplicated {stats['duplicates']} of {stats['files']} files "
+            f"({stats['unique']} unique).",
+            file=sys.stderr,
+        )
+
+    if profiler is not None:
+        _write_profile(profiler, args)
+
 
 if __name__ == "__main__":
     main()
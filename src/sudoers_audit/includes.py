@@ -0,0 +1,145 @@
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from .parser import iter_logical_lines
+
+# Files of one include level are read concurrently by this many threads
+DEFAULT_LOAD_WORKERS = 8
+
+_DIRECTIVE_RE = re.compile(r"^[#@](include|includedir)\s+(.*?)\s*$")
+
+
+@dataclass
+class IncludedFile:
+    """
+    A file of the effective policy, read once, with the include directives
+    it contains as (line number, directive, resolved target paths).
+    """
+
+    path: str
+    data: bytes | None = None
+    error: str | None = None
+    includes: list[tuple[int, str, list[str]]] = field(default_factory=list)
+    # Directives that would re-enter a file that is still being included
+    cycles: list[tuple[int, str, str]] = field(default_factory=list)
+
+
+def _unquote(target: str) -> str:
+    if len(target) >= 2 and target[0] == target[-1] == '"':
+        target = target[1:-1]
+    target = target.replace("\\ ", " ")
+    if "%h" in target:
+        import socket
+
+        target = target.replace("%h", socket.gethostname().split(".")[0])
+    return target
+
+
+def _list_includedir(directory: str) -> list[str]:
+    # sudo skips names ending in '~' or containing '.' (editor and package
+    # manager leftovers); a missing directory is not an error
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    paths = (
+        os.path.join(directory, name)
+        for name in names
+        if not name.endswith("~") and "." not in name
+    )
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def include_directives(path: str, data: bytes) -> Iterator[tuple[int, str, list[str]]]:
+    """
+    Yield (line number, directive, target paths) for each include directive
+    in a sudoers file. Relative targets are resolved against the directory
+    of the including file, and #includedir expands to the files it holds.
+    """
+    base = os.path.dirname(path)
+    text = data.decode("utf-8", errors="replace")
+    for start, _end, line in iter_logical_lines(text.splitlines()):
+        line = line.strip()
+        match = _DIRECTIVE_RE.match(line)
+        if not match:
+            continue
+        target = os.path.normpath(os.path.join(base, _unquote(match.group(2))))
+        if match.group(1) == "includedir":
+            yield start, line, _list_includedir(target)
+        else:
+            yield start, line, [target]
+
+
+def _load(path: str) -> IncludedFile:
+    loaded = IncludedFile(path=path)
+    try:
+        with open(path, "rb") as f:
+            loaded.data = f.read()
+    except PermissionError:
+        loaded.error = "Permission denied. Run with sudo?"
+    except FileNotFoundError:
+        loaded.error = "File not found."
+    except OSError as e:
+        loaded.error = f"Error reading file: {str(e)}"
+    else:
+        loaded.includes = list(include_directives(path, loaded.data))
+    return loaded
+
+
+def _key(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def load_policy(
+    roots: list[str], max_workers: int = DEFAULT_LOAD_WORKERS
+) -> list[IncludedFile]:
+    """
+    Load the root sudoers files and every file they include, directly or
+    through other includes, reading each file exactly once.
+
+    The include graph is explored level by level, the files of a level
+    being read in parallel. Files are returned in the order sudo parses
+    them: depth first, each included file right after its directive.
+    Includes that would re-enter a file still being included are recorded
+    in the including file's `cycles` instead of being followed.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    loaded: dict[str, IncludedFile] = {}
+    frontier = {_key(path): path for path in roots}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier:
+            level = list(executor.map(_load, frontier.values()))
+            loaded.update(zip(frontier, level))
+            frontier = {}
+            for included in level:
+                for _line, _directive, targets in included.includes:
+                    for target in targets:
+                        key = _key(target)
+                        if key not in loaded:
+                            frontier.setdefault(key, target)
+
+    ordered: list[IncludedFile] = []
+    done: set[str] = set()
+    active: set[str] = set()
+
+    def visit(key: str):
+        included = loaded[key]
+        done.add(key)
+        active.add(key)
+        ordered.append(included)
+        for line, directive, targets in included.includes:
+            for target in targets:
+                target_key = _key(target)
+                if target_key in active:
+                    included.cycles.append((line, directive, target))
+                elif target_key not in done:
+                    visit(target_key)
+        active.discard(key)
+
+    for root in roots:
+        if _key(root) not in done:
+            visit(_key(root))
+    return ordered
@@ -0,0 +1,96 @@
+import sys
+from enum import Enum
+
+
+class Severity(Enum):
+    CRITICAL = "CRITICAL"
+    HIGH = "HIGH"
+    MEDIUM = "MEDIUM"
+    WARNING = "WARNING"
+    LOW = "LOW"
+
+    @property
+    def sarif_level(self) -> str:
+        return "error" if self in (Severity.CRITICAL, Severity.HIGH) else "warning"
+
+    @property
+    def css_class(self) -> str:
+        return "" if self is Severity.LOW else self.value.lower()
+
+
+# Rule ID of issues coerced from free text, which carries no rule
+UNCLASSIFIED_RULE_ID = "SUDO000"
+
+
+class Issue:
+    """
+    An issue raised by a rule: severity, stable rule ID, message template
+    and the parameters filling it. The message text is only rendered when
+    asked for; str() gives the classic "SEVERITY: message" form.
+
+    Issues are treated as immutable, so rules share one instance for
+    messages without parameters.
+    """
+
+    __slots__ = ("severity", "rule_id", "template", "params")
+
+    def __init__(
+        self, severity: Severity, rule_id: str, template: str, params: tuple = ()
+    ):
+        self.severity = severity
+        self.rule_id = rule_id
+        self.template = sys.intern(template)
+        self.params = params
+
+    @classmethod
+    def from_text(cls, text: str) -> "Issue":
+        """
+        Coerce a legacy "SEVERITY: message" string into an Issue.
+        """
+        prefix, sep, message = text.partition(": ")
+        if sep and prefix in Severity.__members__:
+            return cls(Severity[prefix], UNCLASSIFIED_RULE_ID, "{}", (message,))
+        return cls(Severity.WARNING, UNCLASSIFIED_RULE_ID, "{}", (text,))
+
+    @property
+    def message(self) -> str:
+        return self.template.format(*self.params) if self.params else self.template
+
+    def via(self, origin: str) -> "Issue":
+        """
+        The same issue, noted as reached through `origin` (e.g. an alias).
+        """
+        return Issue(
+            self.severity,
+            self.rule_id,
+            self.template + " (via {})",
+            (*self.params, origin),
+        )
+
+    def _key(self) -> tuple:
+        return self.severity, self.rule_id, self.template, self.params
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __contains__(self, text: str) -> bool:
+        # Substring checks written against the former plain-string issues
+        return text in str(self)
+
+    def __str__(self) -> str:
+        return f"{self.severity.value}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"Issue({str(self)!r}, rule_id={self.rule_id!r})"
+
+
+def as_issue(issue: "Issue | str") -> Issue:
+    """
+    Accept plain-string issues from older callers wherever Issues are read.
+    """
+    return issue if isinstance(issue, Issue) else Issue.from_text(issue)
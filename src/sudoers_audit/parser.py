@@ -0,0 +1,140 @@
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+
+from .utils import clean_command_string, command_tags, split_sudoers_commands
+
+_INCLUDE_RE = re.compile(r"^[#@]include(?:dir)?\s")
+_DEFAULTS_RE = re.compile(r"^Defaults(?:$|[\s:@>!])")
+_ALIAS_RE = re.compile(r"^(User_Alias|Runas_Alias|Host_Alias|Cmnd_Alias|Cmd_Alias)\s")
+_RUNAS_RE = re.compile(r"^\(([^)]*)\)")
+_ALIAS_NAME_RE = re.compile(r"[A-Z][A-Z0-9_]*")
+
+
+class LineKind(Enum):
+    COMMENT = "comment"
+    INCLUDE = "include"
+    DEFAULTS = "defaults"
+    ALIAS = "alias"
+    USER_SPEC = "user_spec"
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedLine:
+    """
+    A sudoers line parsed once and shared by every rule.
+    """
+
+    text: str
+    kind: LineKind
+    lhs: str = ""
+    rhs: str | None = None
+    runas: str | None = None
+    tags: tuple[str, ...] = ()
+    commands: tuple[str, ...] = ()
+    cleaned: tuple[str, ...] = ()
+    argv: tuple[tuple[str, ...], ...] = ()
+    alias_type: str | None = None
+
+
+def is_alias_name(token: str) -> bool:
+    """
+    Whether a token is shaped like an alias name (the reserved word ALL
+    is not one).
+    """
+    return token != "ALL" and _ALIAS_NAME_RE.fullmatch(token) is not None
+
+
+def classify_line(text: str) -> LineKind:
+    """
+    Determine the kind of a stripped sudoers line.
+    """
+    if not text:
+        return LineKind.COMMENT
+    if text[0] in "#@":
+        if _INCLUDE_RE.match(text):
+            return LineKind.INCLUDE
+        if text[0] == "#":
+            return LineKind.COMMENT
+    if _DEFAULTS_RE.match(text):
+        return LineKind.DEFAULTS
+    if _ALIAS_RE.match(text):
+        return LineKind.ALIAS
+    return LineKind.USER_SPEC
+
+
+def parse_line(line: str) -> ParsedLine:
+    """
+    Parse a raw sudoers line into a ParsedLine.
+    Commands are only extracted from user specifications and alias definitions.
+    """
+    text = line.strip()
+    kind = classify_line(text)
+
+    if kind in (LineKind.COMMENT, LineKind.INCLUDE) or "=" not in text:
+        return ParsedLine(text=text, kind=kind)
+
+    lhs, rhs = text.split("=", 1)
+    lhs = lhs.strip()
+    rhs = rhs.strip()
+
+    if kind is LineKind.DEFAULTS:
+        return ParsedLine(text=text, kind=kind, lhs=lhs, rhs=rhs)
+
+    alias_match = _ALIAS_RE.match(text)
+    runas_match = _RUNAS_RE.match(rhs)
+    commands = tuple(split_sudoers_commands(text))
+    cleaned = tuple(clean_command_string(c) for c in commands)
+
+    tags: list[str] = []
+    for command, clean in zip(commands, cleaned):
+        # Tags live in the prefix removed by clean_command_string
+        for tag in command_tags(command[: len(command) - len(clean)]):
+            if tag not in tags:
+                tags.append(tag)
+
+    return ParsedLine(
+        text=text,
+        kind=kind,
+        lhs=lhs,
+        rhs=rhs,
+        runas=runas_match.group(1) if runas_match else None,
+        tags=tuple(tags),
+        commands=commands,
+        cleaned=cleaned,
+        argv=tuple(tuple(c.split()) for c in cleaned),
+        alias_type=alias_match.group(1) if alias_match else None,
+    )
+
+
+def _continues(text: str) -> bool:
+    # An odd number of trailing backslashes leaves one unescaped
+    return (len(text) - len(text.rstrip("\\"))) % 2 == 1
+
+
+def iter_logical_lines(lines: Iterable[str]) -> Iterator[tuple[int, int, str]]:
+    """
+    Join backslash-continued physical lines into logical sudoers lines.
+    Yields (first line number, last line number, text), numbered from 1.
+    Each continuation is replaced by a single space; comment lines never
+    continue onto the next line.
+    """
+    parts: list[str] = []
+    start = 0
+    for number, line in enumerate(lines, 1):
+        text = line.rstrip()
+        if not parts:
+            start = number
+            if text.lstrip().startswith("#") and not _INCLUDE_RE.match(text.lstrip()):
+                yield start, number, text
+                continue
+        if _continues(text):
+            parts.append(text[:-1].strip())
+            continue
+        parts.append(text.strip())
+        yield start, number, " ".join(p for p in parts if p)
+        parts = []
+    if parts:
+        # Continuation at end of file
+        yield start, number, " ".join(p for p in parts if p)
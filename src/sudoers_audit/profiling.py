@@ -0,0 +1,233 @@
+import random
+import time
+from dataclasses import dataclass
+
+from .auditor import FileAuditResult, SudoersAuditor
+from .issues import Issue
+from .parser import ParsedLine
+from .rules.dispatch import DEFAULT_KINDS, RuleDispatcher
+
+# Per-rule timing samples kept for percentile estimates
+_RESERVOIR_SIZE = 10_000
+
+
+class TimingStats:
+    """
+    Call count, cumulative time, hit count and a bounded sample of call
+    durations (reservoir sampling) for the p99 estimate.
+    """
+
+    __slots__ = ("calls", "hits", "total_ns", "samples", "_rnd")
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.total_ns = 0
+        self.samples: list[int] = []
+        self._rnd = random.Random(0)
+
+    def record(self, elapsed_ns: int, hit: bool):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if hit:
+            self.hits += 1
+        if len(self.samples) < _RESERVOIR_SIZE:
+            self.samples.append(elapsed_ns)
+        else:
+            slot = self._rnd.randrange(self.calls)
+            if slot < _RESERVOIR_SIZE:
+                self.samples[slot] = elapsed_ns
+
+    def p99_ns(self) -> int:
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.calls if self.calls else 0.0,
+            "total_seconds": self.total_ns / 1e9,
+            "p99_seconds": self.p99_ns() / 1e9,
+        }
+
+
+@dataclass
+class FileTiming:
+    file_path: str
+    parse_seconds: float = 0.0
+    audit_seconds: float = 0.0
+
+
+class _ProfiledRule:
+    def __init__(self, rule, stats: TimingStats):
+        self.rule = rule
+        self.stats = stats
+        self.kinds = getattr(rule, "kinds", DEFAULT_KINDS)
+        self.keywords = getattr(rule, "keywords", ())
+        self.expands_aliases = getattr(rule, "expands_aliases", False)
+        check_parsed = getattr(rule, "check_parsed", None)
+        self._check = check_parsed or (lambda parsed: rule.check(parsed.text))
+
+    def check_parsed(self, parsed: ParsedLine) -> list[Issue]:
+        start = time.perf_counter_ns()
+        issues = self._check(parsed)
+        self.stats.record(time.perf_counter_ns() - start, bool(issues))
+        return issues
+
+    def check(self, line: str) -> list[Issue]:
+        return self.rule.check(line)
+
+
+class _ProfiledPathRule:
+    def __init__(self, rule, stats: TimingStats):
+        self.rule = rule
+        self.stats = stats
+
+    def check_path(self, path, stat_info=None) -> list[Issue]:
+        start = time.perf_counter_ns()
+        issues = self.rule.check_path(path, stat_info=stat_info)
+        self.stats.record(time.perf_counter_ns() - start, bool(issues))
+        return issues
+
+
+class Profiler:
+    """
+    Collects per-rule and per-file timings from an instrumented auditor.
+
+    Instrumentation replaces the auditor's rules and hooks with timed
+    wrappers, so an auditor that was never instrumented runs exactly the
+    same code as before and pays nothing for profiling support.
+    """
+
+    def __init__(self):
+        self.rules: dict[str, TimingStats] = {}
+        self.path_rules: dict[str, TimingStats] = {}
+        self.permissions = TimingStats()
+        self.files: list[FileTiming] = []
+        self.auditor: SudoersAuditor | None = None
+        self._parse_ns = 0
+
+    @staticmethod
+    def _unique_name(name: str, existing: dict) -> str:
+        candidate, n = name, 2
+        while candidate in existing:
+            candidate, n = f"{name}#{n}", n + 1
+        return candidate
+
+    def instrument(self, auditor: SudoersAuditor) -> SudoersAuditor:
+        """
+        Wrap the rules and hooks of an auditor with timing instrumentation.
+        """
+        self.auditor = auditor
+
+        wrapped_rules = []
+        for rule in auditor.rules:
+            name = self._unique_name(type(rule).__name__, self.rules)
+            self.rules[name] = TimingStats()
+            wrapped_rules.append(_ProfiledRule(rule, self.rules[name]))
+        auditor.rules = wrapped_rules
+        auditor.dispatcher = RuleDispatcher(wrapped_rules)
+        auditor.alias_dispatcher = auditor.expansion_dispatcher(wrapped_rules)
+
+        wrapped_path_rules = []
+        for rule in auditor.path_rules:
+            name = self._unique_name(type(rule).__name__, self.path_rules)
+            self.path_rules[name] = TimingStats()
+            wrapped_path_rules.append(_ProfiledPathRule(rule, self.path_rules[name]))
+        auditor.path_rules = wrapped_path_rules
+
+        parse_line = auditor.parse_line
+        check_file_permissions = auditor.check_file_permissions
+        audit_file = auditor.audit_file
+        audit_bytes = auditor.audit_bytes
+
+        def timed_parse_line(line: str) -> ParsedLine:
+            start = time.perf_counter_ns()
+            parsed = parse_line(line)
+            self._parse_ns += time.perf_counter_ns() - start
+            return parsed
+
+        def timed_check_file_permissions(path: str) -> list[Issue]:
+            start = time.perf_counter_ns()
+            issues = check_file_permissions(path)
+            self.permissions.record(time.perf_counter_ns() - start, bool(issues))
+            return issues
+
+        def timed(audit):
+            def timed_audit(name: str, *args, **kwargs) -> FileAuditResult:
+                self._parse_ns = 0
+                start = time.perf_counter_ns()
+                result = audit(name, *args, **kwargs)
+                elapsed = time.perf_counter_ns() - start
+                self.files.append(
+                    FileTiming(
+                        file_path=name,
+                        parse_seconds=self._parse_ns / 1e9,
+                        audit_seconds=(elapsed - self._parse_ns) / 1e9,
+                    )
+                )
+                return result
+
+            return timed_audit
+
+        auditor.parse_line = timed_parse_line
+        auditor.check_file_permissions = timed_check_file_permissions
+        auditor.audit_file = timed(audit_file)
+        auditor.audit_bytes = timed(audit_bytes)
+        return auditor
+
+    def to_dict(self) -> dict:
+        return {
+            "rules": {name: s.to_dict() for name, s in self.rules.items()},
+            "path_rules": {name: s.to_dict() for name, s in self.path_rules.items()},
+            "check_file_permissions": self.permissions.to_dict(),
+            "stat_cache": self.auditor.stat_cache.stats() if self.auditor else {},
+            "line_cache": self.auditor.line_cache_info() if self.auditor else {},
+            "files": [vars(f) for f in self.files],
+        }
+
+    def summary_table(self) -> str:
+        """
+        Render the profile as a plain-text table, slowest rules first.
+        """
+        lines = [
+            f"{'rule':<28} {'calls':>9} {'total ms':>10} {'p99 us':>9} {'hit rate':>9}"
+        ]
+        rows = list(self.rules.items()) + list(self.path_rules.items())
+        if self.permissions.calls:
+            rows.append(("check_file_permissions", self.permissions))
+        for name, stats in sorted(rows, key=lambda r: r[1].total_ns, reverse=True):
+            data = stats.to_dict()
+            lines.append(
+                f"{name:<28} {data['calls']:>9} {data['total_seconds'] * 1e3:>10.2f} "
+                f"{data['p99_seconds'] * 1e6:>9.1f} {data['hit_rate']:>9.1%}"
+            )
+
+        if self.auditor and self.auditor.line_cache_size:
+            memo = self.auditor.line_cache_info()
+            lines.append(
+                f"line cache: {memo['hits']} hits, {memo['misses']} misses "
+                f"({memo['hit_rate']:.1%})"
+            )
+            # Memoized lines skip the rules, so their timings cover misses only
+            lines.append(
+                f"rule timings cover the {memo['misses']} lines that missed the "
+                "line cache (--line-cache-size 0 times every line)"
+            )
+        if self.auditor and self.permissions.calls:
+            cache = self.auditor.stat_cache.stats()
+            lines.append(f"stat cache: {cache['hits']} hits, {cache['misses']} misses")
+
+        lines.append("")
+        lines.append(f"{'file':<48} {'parse ms':>10} {'audit ms':>10}")
+        for timing in sorted(
+            self.files, key=lambda f: f.parse_seconds + f.audit_seconds, reverse=True
+        ):
+            lines.append(
+                f"{timing.file_path[-48:]:<48} {timing.parse_seconds * 1e3:>10.2f} "
+                f"{timing.audit_seconds * 1e3:>10.2f}"
+            )
+        return "\n".join(lines)
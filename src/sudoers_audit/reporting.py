@@ -1,39 +1,15 @@
 import csv
 import json
 import html
+import sys
+import textwrap
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from .auditor import FileAuditResult
+from typing import TextIO
+from .auditor import FileAuditResult, Finding
+from .issues import as_issue
 
-
-class ReportGenerator:
-    @staticmethod
-    def generate_csv(results: list[FileAuditResult], output_file: str):
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["File", "Line Number", "Line Content", "Issue"])
-
-            for result in results:
-                if result.error:
-                    writer.writerow(
-                        [result.file_path, "N/A", "N/A", f"ERROR: {result.error}"]
-                    )
-                    continue
-
-                for finding in result.findings:
-                    for issue in finding.issues:
-                        writer.writerow(
-                            [
-                                result.file_path,
-                                finding.line_number,
-                                finding.line_content,
-                                issue,
-                            ]
-                        )
-
-    @staticmethod
-    def generate_html(results: list[FileAuditResult], output_file: str):
-        date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        html_content = f"""
+_HTML_HEADER = """
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -62,51 +38,149 @@ class ReportGenerator:
                 <p>Generated on: {date_str}</p>
         """
 
-        for result in results:
-            html_content += f'<div class="file-section"><div class="file-header">{html.escape(result.file_path)}</div>'
+_HTML_FOOTER = """
+            </div>
+        </body>
+        </html>
+        """
+
+
+# Placeholder for the results array while rendering the SARIF skeleton
+_SARIF_RESULTS_MARKER = "__sudoers_audit_results__"
+
+
+def _line_range(finding: Finding) -> str:
+    end = finding.end_line_number or finding.line_number
+    if end > finding.line_number:
+        return f"{finding.line_number}-{end}"
+    return str(finding.line_number)
+
+
+def _sarif_region(finding: Finding) -> dict:
+    region = {"startLine": finding.line_number}
+    end = finding.end_line_number or finding.line_number
+    if end > finding.line_number:
+        region["endLine"] = end
+    return region
+
+
+class ReportGenerator:
+    @staticmethod
+    def generate_csv(results: Iterable[FileAuditResult], output_file: str):
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["File", "Line Number", "Line Content", "Issue"])
+
+            for result in results:
+                if result.error:
+                    writer.writerow(
+                        [result.file_path, "N/A", "N/A", f"ERROR: {result.error}"]
+                    )
+                    continue
 
-            if result.error:
-                html_content += (
-                    f'<div class="error">Error: {html.escape(result.error)}</div>'
-                )
-            elif not result.findings:
-                html_content += (
-                    '<div class="finding" style="color: green;">No issues found.</div>'
-                )
-            else:
                 for finding in result.findings:
-                    html_content += '<div class="finding">'
-                    html_content += f'<div>Line <span class="line-info">{finding.line_number}</span>: <code>{html.escape(finding.line_content)}</code></div>'
-                    html_content += "<ul>"
                     for issue in finding.issues:
-                        severity_class = ""
-                        if "CRITICAL" in issue:
-                            severity_class = "critical"
-                        elif "HIGH" in issue:
-                            severity_class = "high"
-                        elif "MEDIUM" in issue:
-                            severity_class = "medium"
-                        elif "WARNING" in issue:
-                            severity_class = "warning"
-
-                        html_content += (
-                            f'<li class="{severity_class}">{html.escape(issue)}</li>'
+                        writer.writerow(
+                            [
+                                result.file_path,
+                                finding.line_number,
+                                finding.line_content,
+                                str(issue),
+                            ]
                         )
-                    html_content += "</ul></div>"
 
-            html_content += "</div>"
+    @staticmethod
+    def generate_jsonl(results: Iterable[FileAuditResult], output_file: str):
+        """
+        Write one self-contained JSON record per issue, as each result
+        arrives. Results may hold part of a file's findings (see
+        AuditSession.stream). An output_file of "-" writes to stdout.
+        """
+        if output_file == "-":
+            ReportGenerator._write_jsonl(results, sys.stdout)
+            return
+        with open(output_file, "w", encoding="utf-8") as f:
+            ReportGenerator._write_jsonl(results, f)
 
-        html_content += """
-            </div>
-        </body>
-        </html>
+    @staticmethod
+    def _write_jsonl(results: Iterable[FileAuditResult], f: TextIO):
+        for result in results:
+            if result.error:
+                record = {
+                    "file": result.file_path,
+                    "line": None,
+                    "end_line": None,
+                    "content": None,
+                    "severity": "ERROR",
+                    "rule_id": None,
+                    "message": result.error,
+                }
+                f.write(json.dumps(record) + "\n")
+
+            for finding in result.findings:
+                for issue in map(as_issue, finding.issues):
+                    record = {
+                        "file": result.file_path,
+                        "line": finding.line_number,
+                        "end_line": finding.end_line_number or finding.line_number,
+                        "content": finding.line_content,
+                        "severity": issue.severity.value,
+                        "rule_id": issue.rule_id,
+                        "message": issue.message,
+                    }
+                    f.write(json.dumps(record) + "\n")
+            # Hand each file's records on promptly when piped
+            f.flush()
+
+    @staticmethod
+    def generate_html(results: Iterable[FileAuditResult], output_file: str):
+        """
+        Stream an HTML report to output_file, one file section at a time.
         """
+        date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            f.write(_HTML_HEADER.format(date_str=date_str))
+            for result in results:
+                f.write(ReportGenerator._html_file_section(result))
+            f.write(_HTML_FOOTER)
 
     @staticmethod
-    def generate_sarif(results: list[FileAuditResult], output_file: str):
+    def _html_file_section(result: FileAuditResult) -> str:
+        parts = [
+            f'<div class="file-section"><div class="file-header">{html.escape(result.file_path)}</div>'
+        ]
+
+        if result.error:
+            parts.append(f'<div class="error">Error: {html.escape(result.error)}</div>')
+        elif not result.findings:
+            parts.append(
+                '<div class="finding" style="color: green;">No issues found.</div>'
+            )
+        else:
+            for finding in result.findings:
+                parts.append('<div class="finding">')
+                parts.append(
+                    f'<div>Line <span class="line-info">{_line_range(finding)}</span>: <code>{html.escape(finding.line_content)}</code></div>'
+                )
+                parts.append("<ul>")
+                for issue in map(as_issue, finding.issues):
+                    parts.append(
+                        f'<li class="{issue.severity.css_class}">{html.escape(str(issue))}</li>'
+                    )
+                parts.append("</ul></div>")
+
+        parts.append("</div>")
+        return "".join(parts)
+
+    @staticmethod
+    def generate_sarif(
+        results: Iterable[FileAuditResult], output_file: str, pretty: bool = True
+    ):
+        """
+        Stream a SARIF log to output_file, one result entry at a time.
+        Set pretty to False to write compact JSON without indentation.
+        """
         sarif_log = {
             "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
             "version": "2.1.0",
@@ -119,11 +193,48 @@ class ReportGenerator:
                             "informationUri": "https://github.com/example/sudoers-audit",
                         }
                     },
-                    "results": [],
+                    "results": [_SARIF_RESULTS_MARKER],
                 }
             ],
         }
 
+        # Render the document skeleton once, then splice the results in where
+        # the marker sits so that only one entry is held in memory at a time.
+        if pretty:
+            skeleton = json.dumps(sarif_log, indent=2)
+        else:
+            skeleton = json.dumps(sarif_log, separators=(",", ":"))
+        marker = json.dumps(_SARIF_RESULTS_MARKER)
+        marker_pos = skeleton.index(marker)
+        tail = skeleton[marker_pos + len(marker) :]
+        if pretty:
+            line_start = skeleton.rindex("\n", 0, marker_pos)
+            indent = skeleton[line_start + 1 : marker_pos]
+            head = skeleton[:line_start]
+            separator = ",\n"
+        else:
+            head = skeleton[:marker_pos]
+            separator = ","
+
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(head)
+            count = 0
+            for sarif_result in ReportGenerator._iter_sarif_results(results):
+                if pretty:
+                    entry = textwrap.indent(json.dumps(sarif_result, indent=2), indent)
+                    f.write(separator if count else "\n")
+                else:
+                    entry = json.dumps(sarif_result, separators=(",", ":"))
+                    if count:
+                        f.write(separator)
+                f.write(entry)
+                count += 1
+
+            # An empty list is rendered inline, as json.dump would do
+            f.write(tail if count or not pretty else tail.lstrip())
+
+    @staticmethod
+    def _iter_sarif_results(results: Iterable[FileAuditResult]) -> Iterator[dict]:
         for result in results:
             if result.error:
                 # SARIF results usually map to rules, but here we just report a tool execution error or similar
@@ -131,32 +242,11 @@ class ReportGenerator:
                 continue
 
             for finding in result.findings:
-                for issue in finding.issues:
-                    level = "warning"
-                    if "CRITICAL" in issue or "HIGH" in issue:
-                        level = "error"
-                    elif "NOTE" in issue:
-                        level = "note"
-
-                    # Extract rule ID if possible or make generic
-                    rule_id = "SUDO001"
-                    if "ALL" in issue:
-                        rule_id = "SUDO001"
-                    elif "NOPASSWD" in issue:
-                        rule_id = "SUDO002"
-                    elif "Wildcard" in issue:
-                        rule_id = "SUDO003"
-                    elif "GTFOBins" in issue:
-                        rule_id = "SUDO004"
-                    elif "!requiretty" in issue:
-                        rule_id = "SUDO005"
-                    elif "Recursive" in issue:
-                        rule_id = "SUDO006"
-
-                    sarif_result = {
-                        "ruleId": rule_id,
-                        "level": level,
-                        "message": {"text": issue},
+                for issue in map(as_issue, finding.issues):
+                    yield {
+                        "ruleId": issue.rule_id,
+                        "level": issue.severity.sarif_level,
+                        "message": {"text": str(issue)},
                         "locations": [
                             {
                                 "physicalLocation": {
@@ -165,12 +255,8 @@ class ReportGenerator:
                                             "\\", "/"
                                         )  # SARIF prefers forward slashes
                                     },
-                                    "region": {"startLine": finding.line_number},
+                                    "region": _sarif_region(finding),
                                 }
                             }
                         ],
                     }
-                    sarif_log["runs"][0]["results"].append(sarif_result)
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(sarif_log, f, indent=2)
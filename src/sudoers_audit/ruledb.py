@@ -0,0 +1,109 @@
+import marshal
+import os
+import sys
+import zlib
+
+# Prebuilt rule database: lookup tables that rules would otherwise derive
+# from the bundled data in every process, built once by
+# `python -m sudoers_audit.ruledb`. It is marshalled rather than JSON
+# encoded because marshal loads without any import and much faster; its
+# format is interpreter specific, so the interpreter tag is recorded.
+# The artifact lives inside the package and is trusted like its code.
+
+# Bump when the payload layout changes
+RULEDB_FORMAT = 1
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RULEDB_PATH = os.path.join(_PACKAGE_DIR, "ruledb.bin")
+
+# Sources whose content determines the payload
+_SOURCES = ("ruledb.py", "data.py", os.path.join("rules", "risky_binaries.py"))
+
+
+def sources_checksum() -> int | None:
+    """
+    CRC-32 of the sources the payload is built from, or None when they
+    are not on disk (e.g. in a frozen binary, which ships the artifact
+    built alongside it).
+    """
+    checksum = 0
+    for source in _SOURCES:
+        try:
+            with open(os.path.join(_PACKAGE_DIR, source), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        checksum = zlib.crc32(source.encode() + b"\0" + data, checksum)
+    return checksum
+
+
+def build_payload() -> dict:
+    """
+    Build the database contents in memory from the bundled data.
+    """
+    from .data import RISKY_BINARIES
+    from .rules.risky_binaries import GTFOBinsIndex
+
+    return {"gtfobins": GTFOBinsIndex(RISKY_BINARIES).tables()}
+
+
+def write_ruledb(path: str = RULEDB_PATH) -> str:
+    """
+    Build the database and write it to path, atomically. The file holds
+    a header (format, interpreter tag, checksums of the sources and of the
+    body) and the marshalled body, so that it loads with a single read.
+    """
+    body = marshal.dumps(build_payload())
+    header = (
+        RULEDB_FORMAT,
+        sys.implementation.cache_tag,
+        sources_checksum(),
+        zlib.crc32(body),
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps((header, body)))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def load_ruledb(path: str = RULEDB_PATH) -> dict | None:
+    """
+    Load the prebuilt database, or return None when it is missing,
+    corrupt, built by another interpreter or format, or stale with
+    respect to the sources on disk. Callers then build in memory.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        (db_format, cache_tag, sources, checksum), body = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if db_format != RULEDB_FORMAT or cache_tag != sys.implementation.cache_tag:
+        return None
+    if zlib.crc32(body) != checksum:
+        return None
+    current = sources_checksum()
+    if current is not None and sources != current:
+        return None
+    try:
+        payload = marshal.loads(body)
+    except (EOFError, ValueError, TypeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+if __name__ == "__main__":
+    print(f"Rule database written to {write_ruledb(*sys.argv[1:2])}")
@@ -11,6 +11,7 @@ from .environment import EnvKeepRule
 from .defaults import SudoDefaultsRule, RequireTtyRule
 from .risky_binaries import RiskyBinariesRule
 from .permissions import FileOwnerRule, FileWriteRule, ParentDirectoryRule
+from ..statcache import StatCache
 
 
 def get_all_rules() -> List[AuditRule]:
@@ -30,9 +31,9 @@ def get_all_rules() -> List[AuditRule]:
     ]
 
 
-def get_all_path_rules() -> List[PathRule]:
+def get_all_path_rules(stat_cache: StatCache | None = None) -> List[PathRule]:
     return [
-        FileOwnerRule(),
-        FileWriteRule(),
-        ParentDirectoryRule(),
+        FileOwnerRule(stat_cache),
+        FileWriteRule(stat_cache),
+        ParentDirectoryRule(stat_cache),
     ]
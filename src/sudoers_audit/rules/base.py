@@ -1,12 +1,48 @@
-from typing import Protocol, List
+from abc import ABC, abstractmethod
+from typing import ClassVar, FrozenSet, Protocol, List, Tuple
 import os
 
+from sudoers_audit.issues import Issue
+from sudoers_audit.parser import LineKind, ParsedLine, parse_line
+
 
 class AuditRule(Protocol):
-    def check(self, line: str) -> List[str]: ...
+    def check(self, line: str) -> List[Issue]: ...
+
+
+class ParsedRule(Protocol):
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]: ...
+
+
+class LineRule(ABC):
+    """
+    Base class for rules evaluated against a ParsedLine.
+    Still usable through the plain-text AuditRule protocol.
+
+    `kinds` lists the line kinds the rule applies to. `keywords` lists
+    substrings of which at least one must appear in the line for the rule
+    to match; an empty tuple means the rule always runs. Rules with
+    `expands_aliases` also run on the commands a referenced Cmnd_Alias
+    expands to.
+    """
+
+    kinds: ClassVar[FrozenSet[LineKind]] = frozenset(
+        {LineKind.DEFAULTS, LineKind.ALIAS, LineKind.USER_SPEC}
+    )
+    keywords: ClassVar[Tuple[str, ...]] = ()
+    expands_aliases: ClassVar[bool] = False
+
+    def check(self, line: str) -> List[Issue]:
+        parsed = parse_line(line)
+        if parsed.kind not in self.kinds:
+            return []
+        return self.check_parsed(parsed)
+
+    @abstractmethod
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]: ...
 
 
 class PathRule(Protocol):
     def check_path(
         self, path: str, stat_info: "os.stat_result | None" = None
-    ) -> List[str]: ...
+    ) -> List[Issue]: ...
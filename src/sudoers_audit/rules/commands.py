@@ -1,65 +1,103 @@
 import re
 from typing import List
-from .base import AuditRule
-from sudoers_audit.utils import clean_command_string
+from .base import LineRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.aliases import command_alias_refs
+from sudoers_audit.parser import LineKind, ParsedLine
 
+_ALL_COMMAND_RE = re.compile(r"=(?:.*)\s+ALL\s*$")
+_WILDCARD_PATH_RE = re.compile(r"/\S*\*(?:$|\s)")
 
-class AllCommandRule(AuditRule):
-    def check(self, line: str) -> List[str]:
-        if re.search(r"=(?:.*)\s+ALL\s*$", line):
-            return ["CRITICAL: 'ALL' command granted. Allows execution of any binary."]
+ALL_COMMAND = Issue(
+    Severity.CRITICAL,
+    "SUDO001",
+    "'ALL' command granted. Allows execution of any binary.",
+)
+WILDCARD_PATH = Issue(
+    Severity.CRITICAL,
+    "SUDO003",
+    "Wildcard detected in binary path. Potential for high-risk binary execution.",
+)
+WILDCARD_ARGS = Issue(
+    Severity.HIGH,
+    "SUDO003",
+    "Wildcard '*' detected. Potentially vulnerable to argument injection.",
+)
+RECURSIVE_OPERATION = Issue(
+    Severity.HIGH,
+    "SUDO006",
+    "Recursive file operation detected. Race condition/Symlink attack risk.",
+)
+_RELATIVE_PATH = (
+    "Relative path detected for command '{}'. Vulnerable to path interception."
+)
+
+
+def relative_path_issue(command: str) -> Issue:
+    return Issue(Severity.HIGH, "SUDO007", _RELATIVE_PATH, (command,))
+
+
+class AllCommandRule(LineRule):
+    keywords = ("ALL",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        if _ALL_COMMAND_RE.search(parsed.text):
+            return [ALL_COMMAND]
         return []
 
 
-class WildcardRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+class WildcardRule(LineRule):
+    keywords = ("*",)
+    expands_aliases = True
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
         issues = []
-        if "*" in line:
+        if "*" in parsed.text:
             # Wildcard in binary path check
-            if re.search(r"/\S*\*(?:$|\s)", line.split("=")[1] if "=" in line else ""):
-                issues.append(
-                    "CRITICAL: Wildcard detected in binary path. Potential for high-risk binary execution."
-                )
+            # Only the first '='-delimited field is inspected, as before the
+            # line was parsed, so `A=/bin/*` arguments stay argument wildcards
+            text = parsed.text
+            if _WILDCARD_PATH_RE.search(text.split("=")[1] if "=" in text else ""):
+                issues.append(WILDCARD_PATH)
             else:
-                issues.append(
-                    "HIGH: Wildcard '*' detected. Potentially vulnerable to argument injection."
-                )
+                issues.append(WILDCARD_ARGS)
         return issues
 
 
-class RecursiveOperationRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+class RecursiveOperationRule(LineRule):
+    kinds = frozenset({LineKind.USER_SPEC, LineKind.ALIAS})
+    keywords = ("cp -r", "chown -R", "chmod -R")
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        line = parsed.text
         if "cp -r" in line or "chown -R" in line or "chmod -R" in line:
-            return [
-                "HIGH: Recursive file operation detected. Race condition/Symlink attack risk."
-            ]
+            return [RECURSIVE_OPERATION]
         return []
 
 
-class RelativePathRule(AuditRule):
-    def check(self, line: str) -> List[str]:
-        # Extract just the command part of the sudo rule (after the '=')
-        # Skip Defaults lines as they don't contain commands in the same format
-        if "=" not in line or line.strip().startswith("Defaults"):
-            return []
+class RelativePathRule(LineRule):
+    kinds = frozenset({LineKind.USER_SPEC, LineKind.ALIAS})
+    expands_aliases = True
 
-        from sudoers_audit.utils import split_sudoers_commands
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        # Only the command part of the sudo rule (after the '=') is relevant.
+        # Defaults lines don't contain commands in the same format
+        if parsed.rhs is None or parsed.kind is LineKind.DEFAULTS:
+            return []
 
+        # Cmnd_Alias references are expanded and checked separately; the
+        # auditor reports names never defined as relative paths instead
+        alias_refs = command_alias_refs(parsed)
         issues = []
-        commands = split_sudoers_commands(line)
-
-        for command_part in commands:
-            clean_command_part = clean_command_string(command_part)
-
-            if not clean_command_part:
-                # No command specified, just options
-                cmd_start = "ALL"
-            else:
-                cmd_start = clean_command_part.split(" ")[0]
+        for argv in parsed.argv:
+            # No command specified, just options
+            cmd_start = argv[0] if argv else "ALL"
 
-            if not cmd_start.startswith("/") and cmd_start != "ALL":
-                issues.append(
-                    f"HIGH: Relative path detected for command '{cmd_start}'. Vulnerable to path interception."
-                )
+            if (
+                not cmd_start.startswith("/")
+                and cmd_start != "ALL"
+                and not (len(argv) == 1 and cmd_start in alias_refs)
+            ):
+                issues.append(relative_path_issue(cmd_start))
 
         return issues
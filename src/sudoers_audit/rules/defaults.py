@@ -1,26 +1,45 @@
 from typing import List
-from .base import AuditRule
+from .base import LineRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.parser import LineKind, ParsedLine
 
+NO_USE_PTY = Issue(
+    Severity.MEDIUM,
+    "SUDO013",
+    "'!use_pty' detected. Risk of TIOCSTI terminal hijacking.",
+)
+VISIBLEPW = Issue(
+    Severity.LOW, "SUDO014", "'visiblepw' enabled. Password may be visible."
+)
+NO_REQUIRETTY = Issue(
+    Severity.MEDIUM,
+    "SUDO005",
+    "'!requiretty' detected. May facilitate automated attacks/scripts.",
+)
 
-class SudoDefaultsRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+
+class SudoDefaultsRule(LineRule):
+    kinds = frozenset({LineKind.DEFAULTS})
+    keywords = ("!use_pty", "visiblepw")
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
         issues = []
+        line = parsed.text
         if "Defaults" in line:
             if "!use_pty" in line:
-                issues.append(
-                    "MEDIUM: '!use_pty' detected. Risk of TIOCSTI terminal hijacking."
-                )
+                issues.append(NO_USE_PTY)
             if "visiblepw" in line:
-                issues.append("LOW: 'visiblepw' enabled. Password may be visible.")
+                issues.append(VISIBLEPW)
 
         return issues
 
 
-class RequireTtyRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+class RequireTtyRule(LineRule):
+    kinds = frozenset({LineKind.DEFAULTS, LineKind.USER_SPEC})
+    keywords = ("!requiretty",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
         issues = []
-        if "!requiretty" in line:
-            issues.append(
-                "MEDIUM: '!requiretty' detected. May facilitate automated attacks/scripts."
-            )
+        if "!requiretty" in parsed.text:
+            issues.append(NO_REQUIRETTY)
         return issues
@@ -0,0 +1,87 @@
+import re
+from typing import Callable, Iterable, List
+
+from sudoers_audit.issues import Issue
+from sudoers_audit.parser import LineKind, ParsedLine
+
+# Line kinds a rule applies to when it does not declare its own
+DEFAULT_KINDS = frozenset({LineKind.DEFAULTS, LineKind.ALIAS, LineKind.USER_SPEC})
+
+Check = Callable[[ParsedLine], List[Issue]]
+
+
+def _as_parsed_check(rule) -> Check:
+    check_parsed = getattr(rule, "check_parsed", None)
+    if check_parsed is not None:
+        return check_parsed
+    return lambda parsed: rule.check(parsed.text)
+
+
+class RuleDispatcher:
+    """
+    Routes each parsed line to the rules registered for its kind.
+
+    Rules may declare `kinds` (the LineKinds they apply to) and `keywords`
+    (substrings of which at least one must be present for the rule to
+    match). All keywords are located with one combined regex per line, so
+    rules that cannot match are skipped without running their own scans.
+    """
+
+    def __init__(self, rules: Iterable):
+        self.rules = list(rules)
+
+        all_keywords: set[str] = set()
+        self._by_kind: dict[LineKind, list[tuple[frozenset[str], Check]]] = {
+            kind: [] for kind in LineKind
+        }
+        for rule in self.rules:
+            keywords = frozenset(getattr(rule, "keywords", ()))
+            all_keywords |= keywords
+            check = _as_parsed_check(rule)
+            for kind in getattr(rule, "kinds", DEFAULT_KINDS):
+                self._by_kind[kind].append((keywords, check))
+
+        # Kinds where every rule runs unconditionally need no keyword scan
+        self._needs_scan = {
+            kind: any(keywords for keywords, _ in entries)
+            for kind, entries in self._by_kind.items()
+        }
+
+        # A lookahead finds keywords starting at every position, including
+        # overlapping ones. A keyword found at a position also implies every
+        # other keyword it contains (e.g. '(ALL' implies 'ALL').
+        ordered = sorted(all_keywords, key=len, reverse=True)
+        self._keyword_re = (
+            re.compile("(?=({}))".format("|".join(map(re.escape, ordered))))
+            if ordered
+            else None
+        )
+        self._implied = {
+            keyword: frozenset(k for k in all_keywords if k in keyword)
+            for keyword in all_keywords
+        }
+
+    def keywords_in(self, text: str) -> set[str]:
+        """
+        Return the registered keywords present in a line.
+        """
+        present: set[str] = set()
+        if self._keyword_re is not None:
+            for keyword in set(self._keyword_re.findall(text)):
+                present |= self._implied[keyword]
+        return present
+
+    def checks_for(self, parsed: ParsedLine) -> list[Check]:
+        """
+        Return the rule checks that can possibly match a parsed line.
+        """
+        entries = self._by_kind[parsed.kind]
+        if not self._needs_scan[parsed.kind]:
+            return [check for _, check in entries]
+
+        present = self.keywords_in(parsed.text)
+        return [
+            check
+            for keywords, check in entries
+            if not keywords or not keywords.isdisjoint(present)
+        ]
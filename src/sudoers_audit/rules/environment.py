@@ -1,21 +1,33 @@
 from typing import List
-from .base import AuditRule
+from .base import LineRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.parser import LineKind, ParsedLine
 
+RISKY_ENVS = (
+    "LD_PRELOAD",
+    "LD_LIBRARY_PATH",
+    "PYTHONPATH",
+    "PERL5LIB",
+    "RUBYLIB",
+    "http_proxy",
+)
 
-class EnvKeepRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+
+class EnvKeepRule(LineRule):
+    kinds = frozenset({LineKind.DEFAULTS})
+    keywords = ("env_keep",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        line = parsed.text
         if "env_keep" in line:
-            risky_envs = [
-                "LD_PRELOAD",
-                "LD_LIBRARY_PATH",
-                "PYTHONPATH",
-                "PERL5LIB",
-                "RUBYLIB",
-                "http_proxy",
-            ]
-            found_envs = [env for env in risky_envs if env in line]
+            found_envs = [env for env in RISKY_ENVS if env in line]
             if found_envs:
                 return [
-                    f"HIGH: Risky environment variables in env_keep: {', '.join(found_envs)}. Potential for code injection/MITM."
+                    Issue(
+                        Severity.HIGH,
+                        "SUDO012",
+                        "Risky environment variables in env_keep: {}. Potential for code injection/MITM.",
+                        (", ".join(found_envs),),
+                    )
                 ]
         return []
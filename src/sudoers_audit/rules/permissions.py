@@ -2,60 +2,103 @@ import os
 import stat
 from typing import List
 from .base import PathRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.statcache import StatCache
 
 
-class FileOwnerRule(PathRule):
+class _CachedPathRule(PathRule):
+    def __init__(self, stat_cache: StatCache | None = None):
+        self.stat_cache = stat_cache
+
+    def _stat(self, path: str) -> "os.stat_result | None":
+        if self.stat_cache is not None:
+            return self.stat_cache.stat(path)
+        try:
+            return os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+
+class FileOwnerRule(_CachedPathRule):
     def check_path(
         self, path: str, stat_info: "os.stat_result | None" = None
-    ) -> List[str]:
+    ) -> List[Issue]:
         try:
-            st = stat_info if stat_info else os.stat(path)
-            if st.st_uid != 0:
+            st = stat_info if stat_info else self._stat(path)
+            if st is not None and st.st_uid != 0:
                 return [
-                    f"CRITICAL: File '{path}' is not owned by root (owner uid: {st.st_uid}). Mutable by non-root."
+                    Issue(
+                        Severity.CRITICAL,
+                        "SUDO015",
+                        "File '{}' is not owned by root (owner uid: {}). Mutable by non-root.",
+                        (path, st.st_uid),
+                    )
                 ]
         except OSError:
             pass  # Handled by error catching in parent or unlikely here if exists checked
         return []
 
 
-class FileWriteRule(PathRule):
+class FileWriteRule(_CachedPathRule):
     def check_path(
         self, path: str, stat_info: "os.stat_result | None" = None
-    ) -> List[str]:
+    ) -> List[Issue]:
         issues = []
         try:
-            st = stat_info if stat_info else os.stat(path)
+            st = stat_info if stat_info else self._stat(path)
+            if st is None:
+                return issues
             if st.st_mode & stat.S_IWGRP:
                 issues.append(
-                    f"CRITICAL: File '{path}' is writable by group. Potential for modification."
+                    Issue(
+                        Severity.CRITICAL,
+                        "SUDO016",
+                        "File '{}' is writable by group. Potential for modification.",
+                        (path,),
+                    )
                 )
             if st.st_mode & stat.S_IWOTH:
                 issues.append(
-                    f"CRITICAL: File '{path}' is writable by others. Potential for modification."
+                    Issue(
+                        Severity.CRITICAL,
+                        "SUDO016",
+                        "File '{}' is writable by others. Potential for modification.",
+                        (path,),
+                    )
                 )
         except OSError:
             pass
         return issues
 
 
-class ParentDirectoryRule(PathRule):
+class ParentDirectoryRule(_CachedPathRule):
     def check_path(
         self, path: str, stat_info: "os.stat_result | None" = None
-    ) -> List[str]:
+    ) -> List[Issue]:
         issues = []
         parent_dir = os.path.dirname(path)
-        if os.path.exists(parent_dir):
-            try:
-                parent_st = os.stat(parent_dir)
-                if parent_st.st_uid != 0:
-                    issues.append(
-                        f"HIGH: Parent directory '{parent_dir}' is not owned by root. Risk of file replacement."
+        try:
+            parent_st = self._stat(parent_dir)
+            if parent_st is None:
+                return issues
+            if parent_st.st_uid != 0:
+                issues.append(
+                    Issue(
+                        Severity.HIGH,
+                        "SUDO017",
+                        "Parent directory '{}' is not owned by root. Risk of file replacement.",
+                        (parent_dir,),
                     )
-                if parent_st.st_mode & stat.S_IWOTH:
-                    issues.append(
-                        f"HIGH: Parent directory '{parent_dir}' is writable by others. Risk of file replacement."
+                )
+            if parent_st.st_mode & stat.S_IWOTH:
+                issues.append(
+                    Issue(
+                        Severity.HIGH,
+                        "SUDO018",
+                        "Parent directory '{}' is writable by others. Risk of file replacement.",
+                        (parent_dir,),
                     )
-            except OSError:
-                pass
+                )
+        except OSError:
+            pass
         return issues
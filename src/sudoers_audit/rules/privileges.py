@@ -1,41 +1,74 @@
 import re
 from typing import List
-from .base import AuditRule
+from .base import LineRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.parser import LineKind, ParsedLine
 
+_FULL_PRIVILEGE_RE = re.compile(r"\(ALL(?::ALL)?\)\s+ALL")
+_RUNAS_ALL_RE = re.compile(r"\(ALL(?::ALL)?\)\s+(?!ALL)")
 
-class NopasswdRule(AuditRule):
-    def check(self, line: str) -> List[str]:
-        if "NOPASSWD:" in line:
-            return ["WARNING: 'NOPASSWD' tag used. Allows usage without password."]
+NOPASSWD = Issue(
+    Severity.WARNING, "SUDO002", "'NOPASSWD' tag used. Allows usage without password."
+)
+FULL_PRIVILEGE = Issue(
+    Severity.HIGH, "SUDO008", "'ALL=(ALL) ALL' grant. Grants full root acts."
+)
+RUNAS_ALL = Issue(
+    Severity.MEDIUM,
+    "SUDO009",
+    "'ALL' User (RunAs) granted. User can impersonate any account.",
+)
+NEGATION = Issue(
+    Severity.HIGH,
+    "SUDO010",
+    "Negation rule '!' detected. Deny-lists are ineffective against symlinks/relative paths.",
+)
+NO_AUTHENTICATE = Issue(
+    Severity.CRITICAL,
+    "SUDO011",
+    "'!authenticate' detected. Globally disables authentication.",
+)
+
+
+class NopasswdRule(LineRule):
+    keywords = ("NOPASSWD:",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        if "NOPASSWD:" in parsed.text:
+            return [NOPASSWD]
         return []
 
 
-class FullPrivilegeRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+class FullPrivilegeRule(LineRule):
+    keywords = ("(ALL",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
         issues = []
-        if re.search(r"\(ALL(?::ALL)?\)\s+ALL", line):
-            issues.append("HIGH: 'ALL=(ALL) ALL' grant. Grants full root acts.")
-        if re.search(r"\(ALL(?::ALL)?\)\s+(?!ALL)", line) and "=" in line:
+        line = parsed.text
+        if _FULL_PRIVILEGE_RE.search(line):
+            issues.append(FULL_PRIVILEGE)
+        if parsed.rhs is not None and _RUNAS_ALL_RE.search(line):
             # Check if it's not (ALL) ALL
-            issues.append(
-                "MEDIUM: 'ALL' User (RunAs) granted. User can impersonate any account."
-            )
+            issues.append(RUNAS_ALL)
         return issues
 
 
-class NegationRule(AuditRule):
-    def check(self, line: str) -> List[str]:
+class NegationRule(LineRule):
+    kinds = frozenset({LineKind.USER_SPEC, LineKind.ALIAS})
+    keywords = (", !", "!/")
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        line = parsed.text
         if ", !" in line or "!/" in line:
-            return [
-                "HIGH: Negation rule '!' detected. Deny-lists are ineffective against symlinks/relative paths."
-            ]
+            return [NEGATION]
         return []
 
 
-class AuthenticateRule(AuditRule):
-    def check(self, line: str) -> List[str]:
-        if "!authenticate" in line:
-            return [
-                "CRITICAL: '!authenticate' detected. Globally disables authentication."
-            ]
+class AuthenticateRule(LineRule):
+    kinds = frozenset({LineKind.DEFAULTS, LineKind.USER_SPEC})
+    keywords = ("!authenticate",)
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        if "!authenticate" in parsed.text:
+            return [NO_AUTHENTICATE]
         return []
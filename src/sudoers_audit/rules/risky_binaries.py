@@ -1,43 +1,126 @@
+import functools
 import re
 from typing import List
-from .base import AuditRule
-from ..data import RISKY_BINARIES
-from sudoers_audit.utils import clean_command_string
+from .base import LineRule
+from sudoers_audit.issues import Issue, Severity
+from sudoers_audit.parser import LineKind, ParsedLine
 
 
-class RiskyBinariesRule(AuditRule):
-    def check(self, line: str) -> List[str]:
-        issues = []
-        found_binaries = []
+class GTFOBinsIndex:
+    """
+    Lookup structure over RISKY_BINARIES, built once on first use.
+
+    A binary matches a command when it appears as a whole token, or as the
+    trailing part of a token right after a '/' (e.g. '/usr/bin/vim').
+    Plain names are resolved with a single set lookup on the last path
+    component of each token; the few names containing whitespace or '/'
+    share one compiled alternation.
+    """
+
+    def __init__(self, binaries: dict[str, str]):
+        self.urls = binaries
+        self.names = frozenset(
+            b for b in binaries if "/" not in b and len(b.split()) == 1
+        )
+        others = sorted((b for b in binaries if b not in self.names), key=len)
+        self.pattern = (
+            re.compile(
+                r"(?:^|/|\s)({})(?=\s|$)".format(
+                    "|".join(re.escape(b) for b in reversed(others))
+                )
+            )
+            if others
+            else None
+        )
+
+    def tables(self) -> dict:
+        """
+        The index as plain data, for the prebuilt rule database.
+        """
+        return {
+            "urls": dict(self.urls),
+            "names": sorted(self.names),
+            "pattern": self.pattern.pattern if self.pattern is not None else None,
+        }
+
+    @classmethod
+    def from_tables(
+        cls, urls: dict[str, str], names: list[str], pattern: str | None
+    ) -> "GTFOBinsIndex":
+        """
+        Rebuild an index from tables(), skipping the derivation work.
+        """
+        index = cls.__new__(cls)
+        index.urls = urls
+        index.names = frozenset(names)
+        index.pattern = re.compile(pattern) if pattern is not None else None
+        return index
+
+    def find(self, command: str) -> set[str]:
+        """
+        Return the risky binaries referenced by a cleaned command string.
+        """
+        names = self.names
+        found = {
+            name
+            for token in command.split()
+            if (name := token.rpartition("/")[2]) in names
+        }
+        if self.pattern is not None:
+            found.update(m.group(1) for m in self.pattern.finditer(command))
+        return found
 
-        # Extract just the command part of the sudo rule (after the '=')
-        # Skip Defaults lines as they don't contain commands in the same format
-        if "=" in line and not line.strip().startswith("Defaults"):
-            from sudoers_audit.utils import split_sudoers_commands
 
-            commands = split_sudoers_commands(line)
+@functools.cache
+def gtfobins_index() -> GTFOBinsIndex:
+    """
+    The index over the bundled RISKY_BINARIES. It is loaded from the
+    prebuilt rule database if a valid one is installed, otherwise built from
+    the data, and only once a rule first needs it.
+    """
+    from ..ruledb import load_ruledb
 
-            for command_part in commands:
-                cleaned_cmd = clean_command_string(command_part)
+    db = load_ruledb()
+    if db is not None:
+        return GTFOBinsIndex.from_tables(**db["gtfobins"])
 
-                # Check against every risky binary
-                for binary in RISKY_BINARIES:
-                    # Regex Explanation:
-                    # 1. (?:^|\/|\s) -> Match start of string, a forward slash, or whitespace
-                    # 2. binary     -> The binary name
-                    # 3. (?:\s|$)   -> Match whitespace or end of string
-                    pattern = r"(?:^|\/|\s){}(?:\s|$)".format(re.escape(binary))
+    from ..data import RISKY_BINARIES
+
+    return GTFOBinsIndex(RISKY_BINARIES)
+
+
+class RiskyBinariesRule(LineRule):
+    kinds = frozenset({LineKind.USER_SPEC, LineKind.ALIAS})
+    expands_aliases = True
+
+    def __init__(self, index: GTFOBinsIndex | None = None):
+        self._index = index
+
+    @property
+    def index(self) -> GTFOBinsIndex:
+        if self._index is None:
+            self._index = gtfobins_index()
+        return self._index
+
+    def check_parsed(self, parsed: ParsedLine) -> List[Issue]:
+        issues = []
+        found_binaries = set()
 
-                    if re.search(pattern, cleaned_cmd):
-                        found_binaries.append(binary)
+        # Only cleaned commands are inspected; Defaults lines carry none
+        for cleaned_cmd in parsed.cleaned:
+            found_binaries.update(self.index.find(cleaned_cmd))
 
         if found_binaries:
             # Format: binary: URL
-            # Deduplicate found binaries
-            unique_binaries = sorted(list(set(found_binaries)))
-            binaries_with_urls = [f"{b}: {RISKY_BINARIES[b]}" for b in unique_binaries]
+            unique_binaries = sorted(found_binaries)
+            binaries_with_urls = [f"{b}: {self.index.urls[b]}" for b in unique_binaries]
             issues.append(
-                f"WARNING: GTFOBins detected ({', '.join(binaries_with_urls)}). Known shell escape/privesc vectors."
+                Issue(
+                    Severity.WARNING,
+                    "SUDO004",
+                    "GTFOBins detected ({}). Known shell escape/privesc vectors.",
+                    (", ".join(binaries_with_urls),),
+                )
             )
 
         return issues
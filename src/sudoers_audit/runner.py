@@ -0,0 +1,364 @@
+import dataclasses
+import io
+import os
+from collections.abc import Iterator
+
+from .archives import MAX_MEMBER_SIZE, is_archive, iter_archive_members, member_path
+from .aliases import AliasTable
+from .auditor import DEFAULT_LINE_CACHE_SIZE, FileAuditResult, Finding, SudoersAuditor
+from .issues import Issue, Severity
+from .statcache import DEFAULT_STAT_THREADS
+
+
+class AuditSession:
+    """
+    Audits paths with one auditor and the per-run options of the CLI.
+    The CLI builds one session in-process, or one per pool worker.
+    """
+
+    def __init__(
+        self,
+        auditor: SudoersAuditor | None = None,
+        check_permissions: bool = False,
+        cache_dir: str | None = None,
+        line_cache_size: int = DEFAULT_LINE_CACHE_SIZE,
+        stat_threads: int = DEFAULT_STAT_THREADS,
+        stat_scandir: bool = False,
+    ):
+        self.auditor = auditor or SudoersAuditor(
+            line_cache_size, stat_threads, stat_scandir
+        )
+        self.check_permissions = check_permissions
+        self.cache = None
+        # Permission findings depend on host state, not on file content,
+        # so they are never served from the cache.
+        if cache_dir and not check_permissions:
+            from .cache import AuditCache
+
+            self.cache = AuditCache(cache_dir)
+
+    def audit(self, path: str) -> FileAuditResult:
+        if self.cache is not None:
+            return self.cache.audit(self.auditor, path)
+        return self.auditor.audit_file(path, self.check_permissions)
+
+    def stream(self, path: str) -> Iterator[FileAuditResult]:
+        """
+        Audit a file, yielding a result holding a single finding as soon as
+        each finding is produced, so that memory stays flat however many
+        findings the file has. Findings held back for a later alias
+        definition come out of line order, and a file that cannot be read
+        ends its stream with a result carrying the error.
+        """
+        try:
+            for finding in self.auditor.iter_findings(path, self.check_permissions):
+                yield FileAuditResult(file_path=path, findings=[finding])
+        except Exception as e:
+            yield FileAuditResult(file_path=path, error=self.auditor.read_error(e))
+
+    def audit_archive(self, path: str) -> Iterator[FileAuditResult]:
+        """
+        Audit every regular file inside a tar or zip archive, reading the
+        members straight from the archive. Results are reported under
+        'archive!member' paths; an unreadable archive yields a single
+        result carrying the error.
+        """
+        try:
+            for member, data in iter_archive_members(path):
+                name = member_path(path, member)
+                if data is None:
+                    yield FileAuditResult(
+                        file_path=name,
+                        error=f"Archive member larger than {MAX_MEMBER_SIZE} bytes, skipped.",
+                    )
+                else:
+                    yield self.auditor.audit_bytes(name, data, self.check_permissions)
+        except Exception as e:
+            yield FileAuditResult(file_path=path, error=f"Error reading archive: {e}")
+
+    def audit_policy(self, roots: list[str]) -> Iterator[FileAuditResult]:
+        """
+        Audit root sudoers files together with every file they include, as
+        one policy: each file is read once, all files share one alias
+        table, and results follow sudo's parse order. Include cycles are
+        reported on the directive that closes them.
+        """
+        from .includes import load_policy
+
+        files = load_policy(roots)
+        aliases = AliasTable()
+        for included in files:
+            if included.data is not None:
+                aliases.define_all(io.TextIOWrapper(io.BytesIO(included.data)))
+
+        for included in files:
+            if included.error is not None:
+                yield FileAuditResult(file_path=included.path, error=included.error)
+                continue
+            result = self.auditor.audit_bytes(
+                included.path, included.data, self.check_permissions, aliases
+            )
+            for line, directive, target in included.cycles:
+                result.findings.append(
+                    Finding(
+                        line_number=line,
+                        line_content=directive,
+                        issues=[
+                            Issue(
+                                Severity.MEDIUM,
+                                "SUDO021",
+                                "Include cycle detected. '{}' is already being included.",
+                                (target,),
+                            )
+                        ],
+                        end_line_number=line,
+                    )
+                )
+            result.findings.sort(key=lambda finding: finding.line_number)
+            yield result
+
+    def audit_target(self, path: str) -> Iterator[FileAuditResult]:
+        """
+        Audit a collected path: archives expand to one result per member,
+        any other file yields exactly one result.
+        """
+        if is_archive(path):
+            yield from self.audit_archive(path)
+        else:
+            yield self.audit(path)
+
+
+class Deduplicator:
+    """
+    Groups audit targets by content hash so that each distinct content is
+    audited once and its result reused for every identical file. Archives
+    and files that cannot be read are never grouped, so they are audited
+    (and report their errors) individually.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.duplicates = 0
+        self._first: dict[str, str] = {}
+
+    def representative(self, path: str) -> str:
+        """
+        Return the first path seen with the same content as path, or path
+        itself if its content has not been seen before.
+        """
+        import hashlib
+
+        self.files += 1
+        if is_archive(path):
+            return path
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+        except OSError:
+            return path
+        first = self._first.setdefault(digest, path)
+        if first != path:
+            self.duplicates += 1
+        return first
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "files": self.files,
+            "unique": self.files - self.duplicates,
+            "duplicates": self.duplicates,
+        }
+
+
+# Session built once per worker process by _init_worker
+_worker_session: AuditSession | None = None
+
+
+def _init_worker(
+    check_permissions: bool,
+    cache_dir: str | None,
+    line_cache_size: int,
+    stat_threads: int,
+    stat_scandir: bool,
+):
+    global _worker_session
+    _worker_session = AuditSession(
+        check_permissions=check_permissions,
+        cache_dir=cache_dir,
+        line_cache_size=line_cache_size,
+        stat_threads=stat_threads,
+        stat_scandir=stat_scandir,
+    )
+
+
+def _audit_in_worker(path: str) -> list[FileAuditResult]:
+    return list(_worker_session.audit_target(path))
+
+
+def collect_files(target: str) -> list[str]:
+    """
+    Return the files to audit for a target path, in a stable order.
+    Directories are walked recursively with entries sorted by name.
+    """
+    if not os.path.isdir(target):
+        return [target]
+
+    files = []
+    for root, dirs, names in os.walk(target):
+        dirs.sort()
+        files.extend(os.path.join(root, name) for name in sorted(names))
+    return files
+
+
+def _iter_target_results(
+    paths: list[str],
+    check_permissions: bool,
+    jobs: int,
+    auditor: SudoersAuditor | None,
+    cache_dir: str | None,
+    line_cache_size: int,
+    stat_threads: int,
+    stat_scandir: bool,
+) -> Iterator[list[FileAuditResult]]:
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    if jobs <= 1 or len(paths) <= 1:
+        session = AuditSession(
+            auditor,
+            check_permissions,
+            cache_dir,
+            line_cache_size,
+            stat_threads,
+            stat_scandir,
+        )
+        for path in paths:
+            yield list(session.audit_target(path))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Batch small files to amortize inter-process overhead
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            check_permissions,
+            cache_dir,
+            line_cache_size,
+            stat_threads,
+            stat_scandir,
+        ),
+    ) as executor:
+        # map() preserves input order, keeping reports stable between runs
+        yield from executor.map(_audit_in_worker, paths, chunksize=chunksize)
+
+
+def iter_results(
+    paths: list[str],
+    check_permissions: bool = False,
+    jobs: int = 1,
+    auditor: SudoersAuditor | None = None,
+    cache_dir: str | None = None,
+    dedupe: Deduplicator | None = None,
+    line_cache_size: int = DEFAULT_LINE_CACHE_SIZE,
+    follow_includes: bool = False,
+    stat_threads: int = DEFAULT_STAT_THREADS,
+    stat_scandir: bool = False,
+    stream: bool = False,
+) -> Iterator[FileAuditResult]:
+    """
+    Audit each path and yield results in the same order as `paths`.
+    Archives among the paths yield one result per member, in archive order.
+
+    With jobs > 1 the files and archives are spread across a process pool,
+    each worker building its own SudoersAuditor once. A jobs value of 0 uses
+    one worker per CPU. With cache_dir, unchanged files are served from the
+    persistent audit cache instead of being audited again. With dedupe, all
+    files are hashed up front and only the first file of each distinct
+    content is audited; identical files get a copy of its result.
+    line_cache_size bounds the per-auditor memo of analyzed lines,
+    stat_threads the threads each auditor stats referenced binaries on for
+    the permission checks, and stat_scandir has it list their directories
+    instead (see StatCache); all are ignored when an auditor is passed in.
+
+    With follow_includes, the files are treated as the roots of one policy
+    and the files they include are audited too (see audit_policy). Files
+    are then loaded by threads and audited in this process, without the
+    persistent cache or deduplication. Archives are audited afterwards.
+
+    With stream, files audited serially, without the persistent cache or
+    deduplication, are streamed (see AuditSession.stream): they may yield
+    any number of single-finding results. This suits writers that handle
+    each finding on its own, such as jsonl.
+    """
+    if follow_includes:
+        session = AuditSession(
+            auditor,
+            check_permissions,
+            None,
+            line_cache_size,
+            stat_threads,
+            stat_scandir,
+        )
+        yield from session.audit_policy([p for p in paths if not is_archive(p)])
+        for path in paths:
+            if is_archive(path):
+                yield from session.audit_archive(path)
+        return
+
+    if stream and (jobs == 1 or len(paths) <= 1) and not cache_dir and dedupe is None:
+        session = AuditSession(
+            auditor,
+            check_permissions,
+            None,
+            line_cache_size,
+            stat_threads,
+            stat_scandir,
+        )
+        for path in paths:
+            if is_archive(path):
+                yield from session.audit_archive(path)
+            else:
+                yield from session.stream(path)
+        return
+
+    if dedupe is None:
+        for results in _iter_target_results(
+            paths,
+            check_permissions,
+            jobs,
+            auditor,
+            cache_dir,
+            line_cache_size,
+            stat_threads,
+            stat_scandir,
+        ):
+            yield from results
+        return
+
+    representatives = [dedupe.representative(path) for path in paths]
+    unique = [path for path, rep in zip(paths, representatives) if path == rep]
+    # Only results that later duplicates will copy need to be kept around
+    shared = {rep for path, rep in zip(paths, representatives) if path != rep}
+    kept: dict[str, FileAuditResult] = {}
+
+    audited = _iter_target_results(
+        unique,
+        check_permissions,
+        jobs,
+        auditor,
+        cache_dir,
+        line_cache_size,
+        stat_threads,
+        stat_scandir,
+    )
+    for path, rep in zip(paths, representatives):
+        if path != rep:
+            # A representative always precedes its duplicates in `paths`
+            yield dataclasses.replace(kept[rep], file_path=path)
+            continue
+        results = next(audited)
+        if path in shared:
+            kept[path] = results[0]
+        yield from results
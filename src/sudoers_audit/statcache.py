@@ -0,0 +1,213 @@
+import os
+from collections import OrderedDict
+from collections.abc import Iterable
+
+# Threads used to stat paths ahead of the permission checks
+DEFAULT_STAT_THREADS = 8
+
+_DOT_NAMES = (os.curdir, os.pardir)
+
+
+class StatCache:
+    """
+    Bounded, per-run cache of stat/lstat results keyed by path.
+
+    A single stat call answers both "does it exist?" and "what are its
+    owner and mode?". Missing paths are cached as None and other OSErrors
+    are cached and re-raised, so each path costs at most one syscall per
+    run while it stays in the cache.
+
+    prefetch() stats a batch of paths concurrently on up to `threads`
+    threads, which pays off where each stat is a network round trip. In
+    scandir mode it instead groups the paths by directory and lists each
+    directory once: paths missing from the listing need no stat at all,
+    and the directory's own stat serves the parent directory checks.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        threads: int = DEFAULT_STAT_THREADS,
+        scandir: bool = False,
+    ):
+        self.maxsize = maxsize
+        self.threads = threads
+        self.scandir = scandir
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            tuple[str, bool], os.stat_result | OSError | None
+        ] = OrderedDict()
+        self._executor = None
+
+    def stat(self, path: str) -> os.stat_result | None:
+        """
+        Return os.stat(path), or None if the path does not exist.
+        """
+        return self._lookup(path, True)
+
+    def lstat(self, path: str) -> os.stat_result | None:
+        """
+        Return os.lstat(path), or None if the path does not exist.
+        """
+        return self._lookup(path, False)
+
+    def _lookup(self, path: str, follow_symlinks: bool) -> os.stat_result | None:
+        key = (path, follow_symlinks)
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            entry = self._fetch(path, follow_symlinks)
+            self._store(key, entry)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        if isinstance(entry, OSError):
+            raise entry
+        return entry
+
+    def _store(self, key: tuple[str, bool], entry: os.stat_result | OSError | None):
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _fetch(path: str, follow_symlinks: bool) -> os.stat_result | OSError | None:
+        try:
+            return os.stat(path) if follow_symlinks else os.lstat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        except OSError as e:
+            return e
+
+    @staticmethod
+    def _fetch_stat(path: str) -> os.stat_result | OSError | None:
+        return StatCache._fetch(path, True)
+
+    @staticmethod
+    def _scan(
+        directory: str, names: list[tuple[str, str]]
+    ) -> list[tuple[str, os.stat_result | OSError | None]]:
+        """
+        stat() a directory and the (name, path) entries of it that were
+        asked for, with one listing instead of a stat per missing name.
+        """
+        dir_entry = StatCache._fetch_stat(directory)
+        fetched = [(directory, dir_entry)]
+        if dir_entry is None:
+            # Nothing can exist under a missing directory
+            return fetched + [(path, None) for _, path in names]
+        if not names:
+            return fetched
+
+        wanted = {name for name, _ in names}
+        found: dict[str, os.DirEntry] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name in wanted:
+                        found[entry.name] = entry
+        except OSError:
+            # Not listable (e.g. execute-only): stat each path instead
+            return fetched + [(path, StatCache._fetch_stat(path)) for _, path in names]
+
+        for name, path in names:
+            entry = found.get(name)
+            if entry is None:
+                # Listings never hold the "." and ".." entries
+                fetched.append(
+                    (path, StatCache._fetch_stat(path) if name in _DOT_NAMES else None)
+                )
+                continue
+            try:
+                fetched.append((path, entry.stat()))
+            except (FileNotFoundError, NotADirectoryError):
+                fetched.append((path, None))
+            except OSError as e:
+                fetched.append((path, e))
+        return fetched
+
+    @property
+    def prefetches(self) -> bool:
+        """
+        Whether prefetch() does anything in this configuration.
+        """
+        return self.threads > 1 or self.scandir
+
+    def _map(self, func, items: list) -> Iterable:
+        if self.threads < 2 or len(items) < 2:
+            return map(func, items)
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Kept for the whole run; idle threads are joined at exit
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix="stat"
+            )
+        return self._executor.map(func, items)
+
+    def prefetch(self, paths: Iterable[str]):
+        """
+        stat() the given paths that are not cached yet, ahead of use, so
+        that the lookups that follow are cache hits: concurrently, and/or by
+        directory scans in scandir mode. The worker threads only make the
+        syscalls; the cache itself is filled by the calling thread. All the
+        paths stay cached as long as there are no more than maxsize.
+        """
+        if not self.prefetches:
+            return
+        missing = []
+        for path in dict.fromkeys(paths):
+            if (path, True) in self._entries:
+                # Keep cached paths from being evicted by the ones fetched now
+                self._entries.move_to_end((path, True))
+            else:
+                missing.append(path)
+        if not missing:
+            return
+
+        if not self.scandir:
+            fetched = zip(missing, self._map(self._fetch_stat, missing))
+        else:
+            by_dir: dict[str, list[tuple[str, str]]] = {}
+            singles = []
+            for path in missing:
+                directory, name = os.path.split(path)
+                if name and directory:
+                    by_dir.setdefault(directory, []).append((name, path))
+                else:
+                    singles.append(path)
+            # Paths naming a scanned directory get its stat from the scan, and
+            # directories left with nothing to look up need no listing
+            singles = [path for path in singles if path not in by_dir]
+            scans = [
+                (directory, [(n, p) for n, p in names if p not in by_dir])
+                for directory, names in by_dir.items()
+            ]
+            requested = set(missing)
+            scans = [(d, names) for d, names in scans if names or d in requested]
+            fetched = [
+                *zip(singles, map(self._fetch_stat, singles)),
+                *(
+                    item
+                    for scanned in self._map(lambda scan: self._scan(*scan), scans)
+                    for item in scanned
+                ),
+            ]
+
+        for path, entry in fetched:
+            self.misses += 1
+            self._store((path, True), entry)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the hit/miss counters and current size of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -1,36 +1,39 @@
 import re
 
 
+# A single sudo-specific prefix. The alternatives start with disjoint
+# characters, so at most one of them can match at a given position.
+_PREFIX_TOKEN = r"""
+    \([\w\:\.\-,\s]+\)\s+             # RunAs, e.g. (root, bin) or (user:group)
+  | (?P<tag>[A-Z_]+):\s*                # Tags, e.g. NOPASSWD:, EXEC:, SETENV:
+  | \![\w]+(?:$|\s+)                    # Overrides, e.g. !requiretty
+  | \w+=\w+(?:$|\s+)                    # Key=value settings, e.g. env_reset=true
+  | [a-z0-9]+:[a-zA-Z0-9+/=]+\s+         # Digests, e.g. sha224:...
+"""
+_PREFIX_TOKEN_RE = re.compile(_PREFIX_TOKEN, re.VERBOSE)
+_PREFIXES_RE = re.compile(f"(?:{_PREFIX_TOKEN})*", re.VERBOSE)
+
+
 def clean_command_string(command_part: str) -> str:
     """
     Strips sudo-specific prefixes (e.g., RunAs, tags, overrides) from a command string.
     Returns the cleaned command string.
     """
     clean_command_part = command_part.strip()
+    # All prefixes are consumed in one left-to-right match
+    return clean_command_part[_PREFIXES_RE.match(clean_command_part).end() :]
 
-    # Iteratively strip prefixes until no change
-    while True:
-        original = clean_command_part
-        # Strip RunAs
-        clean_command_part = re.sub(
-            r"^\([\w\:\.\-,\s]+\)\s+", "", clean_command_part
-        )  # Updated to include commas and spaces
-        # Strip sudo tags (e.g. NOPASSWD:, EXEC:, SETENV:)
-        clean_command_part = re.sub(r"^[A-Z_]+:\s*", "", clean_command_part)
-        # Strip overrides (e.g. !requiretty, env_reset)
-        clean_command_part = re.sub(r"^\![\w]+(?:$|\s+)", "", clean_command_part)
-        clean_command_part = re.sub(
-            r"^\w+=\w+(?:$|\s+)", "", clean_command_part
-        )  # Key=value settings
-        # Strip digests (sha224:...)
-        clean_command_part = re.sub(
-            r"^[a-z0-9]+:[a-zA-Z0-9+/=]+\s+", "", clean_command_part
-        )
-
-        if clean_command_part == original:
-            break
 
-    return clean_command_part
+def command_tags(prefix: str) -> list[str]:
+    """
+    Returns the tags (e.g. NOPASSWD, SETENV) of a prefix removed by
+    clean_command_string.
+    """
+    return [
+        match.group("tag")
+        for match in _PREFIX_TOKEN_RE.finditer(prefix)
+        if match.group("tag")
+    ]
 
 
 def split_sudoers_commands(line: str) -> list[str]:
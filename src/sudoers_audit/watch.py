@@ -0,0 +1,309 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable
+from typing import TextIO
+
+from .auditor import FileAuditResult, SudoersAuditor
+from .runner import AuditSession, collect_files
+
+# inotify(7) event bits
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """
+    Detects changes by comparing stat snapshots of the target's files
+    every `interval` seconds. Works everywhere, at the cost of latency.
+    """
+
+    def __init__(self, target: str, interval: float = 1.0):
+        self.target = target
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int, int]]:
+        snapshot = {}
+        for path in collect_files(self.target):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+
+    def changes(self, timeout: float | None = None) -> set[str]:
+        """
+        Wait until files change or `timeout` seconds pass (None waits
+        forever), and return the changed, created and deleted paths.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in self._snapshot.keys() | snapshot.keys()
+                if self._snapshot.get(path) != snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify through ctypes. Directories are watched recursively; a
+    single-file target is watched through its parent directory so that
+    editors replacing the file by rename are noticed too.
+    """
+
+    def __init__(self, target: str, settle: float = 0.05):
+        self.target = target
+        self.settle = settle
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs: dict[int, str] = {}
+        self._is_dir = os.path.isdir(target)
+        try:
+            if self._is_dir:
+                self._add_tree(target)
+            else:
+                self._add(os.path.dirname(target) or ".")
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add(self, directory: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._dirs[wd] = directory
+
+    def _add_tree(self, top: str):
+        for root, dirs, _names in os.walk(top):
+            dirs.sort()
+            self._add(root)
+
+    def changes(self, timeout: float | None = None) -> set[str]:
+        """
+        Wait until files change or `timeout` seconds pass (None waits
+        forever), and return the changed, created and deleted paths.
+        """
+        changed: set[str] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        # Let bursts of writes (editors, package managers) settle into one batch
+        while ready:
+            changed |= self._read()
+            ready, _, _ = select.select([self._fd], [], [], self.settle)
+        return changed
+
+    def _read(self) -> set[str]:
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return set()
+
+        changed: set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped; have the whole target re-audited
+                changed.add(self.target)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            if not name:
+                continue
+
+            if not self._is_dir:
+                if name == os.path.basename(self.target):
+                    changed.add(self.target)
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                try:
+                    self._add_tree(path)
+                except OSError:
+                    pass
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def open_watcher(target: str, interval: float = 1.0):
+    """
+    An inotify watcher where the platform supports it, else a poller.
+    """
+    try:
+        return InotifyWatcher(target)
+    except (OSError, AttributeError, TypeError):
+        # No inotify (not Linux, or no libc found): poll instead
+        return PollingWatcher(target, interval)
+
+
+def _within(file_path: str, path: str) -> bool:
+    return (
+        file_path == path
+        or file_path.startswith(path.rstrip(os.sep) + os.sep)
+        or file_path.startswith(f"{path}!")
+    )
+
+
+class WatchState:
+    """
+    The current findings of every watched file. Refreshing changed paths
+    re-audits only those files and returns what appeared or went away.
+    """
+
+    def __init__(self, session: AuditSession):
+        self.session = session
+        self._records: dict[str, dict[tuple[str, str], dict]] = {}
+
+    def refresh(self, paths: Iterable[str]) -> list[dict]:
+        """
+        Re-audit the given files, or the files under the given directories,
+        and return 'new' and 'resolved' events for the difference with the
+        previous findings. Paths that no longer exist resolve everything
+        reported for them.
+        """
+        auditor = self.session.auditor
+        if self.session.check_permissions:
+            # Referenced binaries may have changed along with the policy
+            auditor.stat_cache.clear()
+
+        events: list[dict] = []
+        for path in sorted(paths):
+            stale = {f for f in self._records if _within(f, path)}
+            files = collect_files(path) if os.path.isdir(path) else [path]
+            for file_path in files:
+                if not os.path.isfile(file_path):
+                    continue
+                for result in self.session.audit_target(file_path):
+                    stale.discard(result.file_path)
+                    events.extend(self._update(result))
+            for file_path in sorted(stale):
+                events.extend(self._update(FileAuditResult(file_path=file_path)))
+        return events
+
+    def _update(self, result: FileAuditResult) -> list[dict]:
+        current: dict[tuple[str, str], dict] = {}
+        if result.error:
+            current[("", result.error)] = {
+                "file": result.file_path,
+                "error": result.error,
+            }
+        for finding in result.findings:
+            for issue in finding.issues:
+                # Keyed by content, so lines shifting within a file are not churn
+                current[(finding.line_content, str(issue))] = {
+                    "file": result.file_path,
+                    "line": finding.line_number,
+                    "content": finding.line_content,
+                    "issue": str(issue),
+                }
+
+        previous = self._records.pop(result.file_path, {})
+        if current:
+            self._records[result.file_path] = current
+        events = [
+            {"event": "new", **record}
+            for key, record in current.items()
+            if key not in previous
+        ]
+        events.extend(
+            {"event": "resolved", **record}
+            for key, record in previous.items()
+            if key not in current
+        )
+        return events
+
+
+def run_watch(
+    target: str,
+    auditor: SudoersAuditor | None = None,
+    check_permissions: bool = False,
+    interval: float = 1.0,
+    out: TextIO | None = None,
+    watcher=None,
+):
+    """
+    Audit the target, then keep re-auditing the files that change under it
+    until interrupted, writing one JSON object per new or resolved finding.
+    The initial audit reports every current finding as new. Events go to
+    stdout unless out is given.
+    """
+    out = out or sys.stdout
+    session = AuditSession(auditor, check_permissions)
+    state = WatchState(session)
+    # Start watching first so that changes during the initial audit are seen
+    watcher = watcher or open_watcher(target, interval)
+
+    def emit(events: list[dict]):
+        for event in events:
+            out.write(json.dumps(event) + "\n")
+        out.flush()
+
+    try:
+        emit(state.refresh([target]))
+        while True:
+            changed = watcher.changes()
+            if changed:
+                emit(state.refresh(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,147 @@
+import os
+import sys
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.aliases import AliasTable, command_alias_refs
+from sudoers_audit import auditor as auditor_module
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.parser import parse_line
+
+
+def _table(*lines):
+    table = AliasTable()
+    for line in lines:
+        table.define_line(parse_line(line))
+    return table
+
+
+def test_expand_nested_and_forward_references():
+    table = _table(
+        "Cmnd_Alias ADMIN = SHELLS, /bin/ls, !/bin/rm",
+        "Cmd_Alias SHELLS = /bin/sh, /bin/ls : EDITORS = /usr/bin/vi",
+    )
+
+    assert table.expand("Cmnd_Alias", "ADMIN") == ("/bin/sh", "/bin/ls")
+    assert table.expand("Cmnd_Alias", "EDITORS") == ("/usr/bin/vi",)
+    assert table.missing("Cmnd_Alias", "ADMIN") == set()
+
+
+def test_expand_cycles_and_undefined():
+    table = _table("Cmnd_Alias A = B, /bin/a", "Cmnd_Alias B = A, C, /bin/b")
+
+    assert table.expand("Cmnd_Alias", "A") == ("/bin/b", "/bin/a")
+    assert table.missing("Cmnd_Alias", "A") == {"C"}
+    assert table.expand("Cmnd_Alias", "C") == ()
+
+
+def test_missing_is_memoized_per_complete_alias():
+    table = _table("Cmnd_Alias A = B, /bin/a")
+    assert table.missing("Cmnd_Alias", "A") == {"B"}
+
+    table.define_line(parse_line("Cmnd_Alias B = /bin/b"))
+    assert table.missing("Cmnd_Alias", "A") == set()
+    # A complete alias nested in a new one does not hide its other gaps
+    table.define_line(parse_line("Cmnd_Alias C = A, D"))
+    assert table.missing("Cmnd_Alias", "C") == {"D"}
+    assert table.missing("Cmnd_Alias", "A") == set()
+
+
+def test_alias_types_are_separate():
+    table = _table("User_Alias ADMINS = alice, bob", "Host_Alias ADMINS = web01")
+
+    assert table.expand("User_Alias", "ADMINS") == ("alice", "bob")
+    assert table.expand("Host_Alias", "ADMINS") == ("web01",)
+    assert not table.is_defined("Cmnd_Alias", "ADMINS")
+
+
+def test_command_alias_refs():
+    refs = command_alias_refs(
+        parse_line("bob ALL = (root) NOPASSWD: SHELLS, !EDIT, ALL")
+    )
+    assert refs == ["SHELLS"]
+    assert command_alias_refs(parse_line("User_Alias ADMINS = BOB")) == []
+
+
+def test_alias_reference_reports_expanded_binaries():
+    auditor = SudoersAuditor()
+    lines = [
+        "bob ALL = SHELLS\n",
+        "Cmnd_Alias SHELLS = /bin/bash, ./run\n",
+        "alice ALL = SHELLS\n",
+        "root ALL=(ALL:ALL) ALL\n",
+    ]
+
+    findings = list(auditor.iter_line_findings(lines))
+
+    # Line 1 waits for the definition on line 2, which is not held
+    assert [f.line_number for f in findings] == [2, 1, 3, 4]
+    findings.sort(key=lambda f: f.line_number)
+    for finding in (findings[0], findings[2]):
+        issues = " ".join(map(str, finding.issues))
+        assert "bash: https://gtfobins.github.io" in issues
+        assert "Relative path detected for command './run'" in issues
+        assert "(via Cmnd_Alias SHELLS)" in issues
+        assert "command 'SHELLS'" not in issues
+
+
+def test_cyclic_alias_issues_are_reported_once():
+    auditor = SudoersAuditor()
+    lines = [
+        "Cmnd_Alias A = B, /usr/bin/vim\n",
+        "Cmnd_Alias B = A, /usr/bin/vim\n",
+        "bob ALL = A, B, /usr/bin/vim\n",
+        "alice ALL = A, B\n",
+    ]
+
+    findings = sorted(auditor.iter_line_findings(lines), key=lambda f: f.line_number)
+
+    for finding in findings:
+        gtfobins = [i for i in finding.issues if "vim: https://gtfobins" in i]
+        assert len(gtfobins) == 1, finding
+    assert "(via Cmnd_Alias A)" in findings[3].issues[0]
+
+
+def test_undefined_alias_is_reported_as_relative_path():
+    auditor = SudoersAuditor()
+    lines = ["dave ALL = /usr/bin/MYSCRIPT, DEPLOY\n", "root ALL=(ALL:ALL) ALL\n"]
+
+    findings = list(auditor.iter_line_findings(lines))
+
+    # The unresolved line does not hold back the unrelated one
+    assert [f.line_number for f in findings] == [2, 1]
+    assert [str(i) for i in findings[1].issues] == [
+        "HIGH: Relative path detected for command 'DEPLOY'. "
+        "Vulnerable to path interception."
+    ]
+
+
+def test_alias_name_with_arguments_is_a_relative_path():
+    auditor = SudoersAuditor()
+
+    # Only a bare name refers to a Cmnd_Alias; with arguments it is a command
+    issues = auditor.analyze_line(1, "bob ALL = MYSCRIPT arg, MYSCRIPT")
+    assert [str(i) for i in issues] == [
+        "HIGH: Relative path detected for command 'MYSCRIPT'. "
+        "Vulnerable to path interception."
+    ]
+    assert auditor.analyze_line(2, "bob ALL = MYSCRIPT") == []
+
+
+def test_held_findings_are_bounded(monkeypatch):
+    monkeypatch.setattr(auditor_module, "MAX_HELD_FINDINGS", 2)
+    auditor = SudoersAuditor()
+    lines = [f"user{i} ALL = LATER\n" for i in range(5)]
+    lines.append("Cmnd_Alias LATER = /bin/sh\n")
+
+    findings = list(auditor.iter_line_findings(lines))
+
+    # The oldest lines were released before the definition was seen
+    by_line = {f.line_number: " ".join(map(str, f.issues)) for f in findings}
+    for line in (1, 2, 3):
+        assert "command 'LATER'" in by_line[line]
+    for line in (4, 5):
+        assert "(via Cmnd_Alias LATER)" in by_line[line]
+    result = auditor.audit_bytes("sudoers", "".join(lines).encode())
+    assert [f.line_number for f in result.findings] == [1, 2, 3, 4, 5, 6]
@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+import tarfile
+import zipfile
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.archives import is_archive, iter_archive_members
+from sudoers_audit.runner import Deduplicator, collect_files, iter_results
+
+MEMBERS = {
+    "etc/sudoers": b"root ALL=(ALL:ALL) ALL\n",
+    "etc/sudoers.d/app": b"# comment\napp ALL=(root) NOPASSWD: /usr/bin/vim\n",
+}
+
+
+def _write_tar(path, mode):
+    with tarfile.open(path, mode) as tar:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _write_zip(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("etc/", "")
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+
+
+def test_is_archive():
+    assert is_archive("hosts/web01.tar.gz")
+    assert is_archive("hosts/WEB01.ZIP")
+    assert is_archive("hosts/web01.txz")
+    assert not is_archive("hosts/sudoers")
+    assert not is_archive("hosts/sudoers.gz")
+
+
+def test_iter_archive_members_skips_directories(tmp_path):
+    path = str(tmp_path / "host.zip")
+    _write_zip(path)
+
+    assert list(iter_archive_members(path)) == list(MEMBERS.items())
+
+
+def test_archives_are_audited_by_member(tmp_path):
+    for name, mode in (("a.tar", "w"), ("b.tar.gz", "w:gz"), ("c.tar.xz", "w:xz")):
+        _write_tar(str(tmp_path / name), mode)
+    _write_zip(str(tmp_path / "d.zip"))
+
+    results = list(iter_results(collect_files(str(tmp_path))))
+
+    expected = [
+        f"{tmp_path / archive}!{member}"
+        for archive in ("a.tar", "b.tar.gz", "c.tar.xz", "d.zip")
+        for member in MEMBERS
+    ]
+    assert [r.file_path for r in results] == expected
+    for result in results:
+        assert result.error is None
+        issues = " ".join(str(i) for f in result.findings for i in f.issues)
+        if result.file_path.endswith("!etc/sudoers"):
+            assert "CRITICAL: 'ALL' command granted" in issues
+        else:
+            assert result.findings[0].line_number == 2
+            assert "WARNING: 'NOPASSWD' tag used" in issues
+
+
+def test_archives_parallel_matches_serial(tmp_path):
+    for i in range(3):
+        _write_tar(str(tmp_path / f"host{i}.tgz"), "w:gz")
+    paths = collect_files(str(tmp_path))
+
+    serial = list(iter_results(paths))
+    parallel = list(iter_results(paths, jobs=2))
+
+    assert serial == parallel
+    assert len(serial) == 3 * len(MEMBERS)
+
+
+def test_corrupt_archive_reports_error(tmp_path):
+    path = tmp_path / "broken.tar.gz"
+    path.write_bytes(b"not an archive")
+
+    results = list(iter_results([str(path)]))
+
+    assert len(results) == 1
+    assert results[0].file_path == str(path)
+    assert results[0].error.startswith("Error reading archive")
+
+
+def test_dedupe_keeps_archives_separate(tmp_path):
+    _write_tar(str(tmp_path / "a.tar"), "w")
+    _write_tar(str(tmp_path / "b.tar"), "w")
+    (tmp_path / "c").write_bytes(MEMBERS["etc/sudoers"])
+    (tmp_path / "d").write_bytes(MEMBERS["etc/sudoers"])
+    paths = collect_files(str(tmp_path))
+    dedupe = Deduplicator()
+
+    results = list(iter_results(paths, jobs=2, dedupe=dedupe))
+
+    assert [r.file_path for r in results] == [r.file_path for r in iter_results(paths)]
+    assert results[-1].findings == results[-2].findings
+    assert dedupe.stats() == {"files": 4, "unique": 3, "duplicates": 1}
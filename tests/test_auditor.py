@@ -31,7 +31,7 @@ def test_analyze_line_wildcard(auditor):
 def test_analyze_line_risky_binary(auditor):
     findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/vim")
     assert any("WARNING: GTFOBins detected" in f for f in findings)
-    combined_msg = "".join(findings)
+    combined_msg = "".join(map(str, findings))
     assert "vim: https://gtfobins.github.io/gtfobins/vim/#sudo" in combined_msg
 
 
@@ -44,7 +44,7 @@ def test_analyze_line_safe(auditor):
 def test_analyze_line_multiple_risky(auditor):
     findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/vim, /usr/bin/bash")
     # Both vim and bash are risky and should be detected even if separated by comma
-    combined_msg = "".join(findings)
+    combined_msg = "".join(map(str, findings))
     assert "vim: https://gtfobins.github.io/gtfobins/vim/#sudo" in combined_msg
     assert "bash: https://gtfobins.github.io/gtfobins/bash/#sudo" in combined_msg
 
@@ -52,7 +52,7 @@ def test_analyze_line_multiple_risky(auditor):
 def test_analyze_line_multiple_commands_mixed_safety(auditor):
     # Test identifying a risky binary when it is second in the list
     findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/ls, /usr/bin/vim")
-    combined_msg = "".join(findings)
+    combined_msg = "".join(map(str, findings))
     assert "vim: https://gtfobins.github.io/gtfobins/vim/#sudo" in combined_msg
     # Ensure ls didn't trigger a false positive (though ls isn't risky anyway)
 
@@ -118,7 +118,7 @@ def test_analyze_line_risky_binary_runas_stripping(auditor):
     # Regression test for RunAs prefix stripping check (e.g. (ALL) (ALL))
     findings = auditor.analyze_line(1, "user2 ALL=(ALL) (ALL) /bin/bash")
     assert any("WARNING: GTFOBins detected" in f for f in findings)
-    combined_msg = "".join(findings)
+    combined_msg = "".join(map(str, findings))
     assert "bash: https://gtfobins.github.io/gtfobins/bash/#sudo" in combined_msg
 
 
@@ -134,5 +134,93 @@ def test_analyze_line_risky_binary_with_nopasswd(auditor):
     findings = auditor.analyze_line(1, "user ALL=(ALL:ALL) NOPASSWD: /bin/sh")
     assert any("WARNING: GTFOBins detected" in f for f in findings)
     assert any("WARNING: 'NOPASSWD' tag used" in f for f in findings)
-    combined_msg = "".join(findings)
+    combined_msg = "".join(map(str, findings))
     assert "sh: https://gtfobins.github.io/gtfobins/sh/#sudo" in combined_msg
+
+
+def test_analyze_line_risky_binary_token_boundaries(auditor):
+    # Binaries must match whole tokens or path basenames, not substrings
+    findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/vimx, /opt/bash/x")
+    assert not any("GTFOBins" in f for f in findings)
+
+    findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/env python3 -c x")
+    combined_msg = "".join(map(str, findings))
+    assert "env: https://gtfobins.github.io/gtfobins/env/#sudo" in combined_msg
+    assert "python3: https://gtfobins.github.io/gtfobins/python3/#sudo" in combined_msg
+
+
+def test_analyze_line_risky_binary_multi_word(auditor):
+    findings = auditor.analyze_line(1, "user ALL=(ALL) /usr/bin/if top")
+    assert "if top: https://gtfobins.github.io" in "".join(map(str, findings))
+
+
+def test_iter_findings_streams(auditor, tmp_path):
+    d = tmp_path / "sudoers"
+    d.write_text(
+        "# comment\nuser ALL=(ALL) NOPASSWD: /bin/ls\nroot ALL=(ALL:ALL) ALL\n"
+    )
+
+    findings = auditor.iter_findings(str(d))
+    first = next(findings)
+    assert first.line_number == 2
+    assert any("NOPASSWD" in issue for issue in first.issues)
+    assert [f.line_number for f in findings] == [3]
+
+
+def test_iter_findings_raises_on_missing_file(auditor, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(auditor.iter_findings(str(tmp_path / "missing")))
+    assert auditor.audit_file(str(tmp_path / "missing")).error == "File not found."
+
+
+def test_analyze_line_memoized(auditor):
+    first = auditor.analyze_line(1, "%admin ALL=(ALL) ALL")
+    first.append("mutated by caller")
+    second = auditor.analyze_line(2, "  %admin ALL=(ALL) ALL\n")
+
+    assert "mutated by caller" not in second
+    info = auditor.line_cache_info()
+    assert (info["hits"], info["misses"]) == (1, 1)
+    assert info["hit_rate"] == 0.5
+
+
+def test_line_cache_bounded_and_disabled():
+    auditor = SudoersAuditor(line_cache_size=2)
+    for i in range(5):
+        auditor.analyze_line(i, f"user{i} ALL=(ALL) ALL")
+    assert auditor.line_cache_info()["size"] == 2
+
+    uncached = SudoersAuditor(line_cache_size=0)
+    assert uncached.analyze_line(1, "root ALL=(ALL) ALL") == auditor.analyze_line(
+        1, "root ALL=(ALL) ALL"
+    )
+    assert uncached.line_cache_info()["hits"] == 0
+
+
+def test_permission_checks_not_memoized(tmp_path):
+    auditor = SudoersAuditor()
+    binary = tmp_path / "tool"
+    line = f"user ALL=(ALL) {binary}\n"
+
+    missing = list(auditor.iter_line_findings([line], check_permissions=True))
+    assert "not found" in " ".join(map(str, missing[0].issues))
+
+    binary.write_text("")
+    auditor.stat_cache.clear()
+    present = list(auditor.iter_line_findings([line], check_permissions=True))
+    assert "not found" not in " ".join(str(i) for f in present for i in f.issues)
+    assert auditor.line_cache_info()["hits"] == 1
+
+
+def test_continued_line_analyzed_once(auditor):
+    lines = [
+        "user ALL=(ALL) \\\n",
+        "    NOPASSWD: /bin/ls, \\\n",
+        "    /bin/cat\n",
+        "root ALL=(ALL:ALL) ALL\n",
+    ]
+    findings = list(auditor.iter_line_findings(lines))
+
+    assert [(f.line_number, f.end_line_number) for f in findings] == [(1, 3), (4, 4)]
+    assert findings[0].line_content == "user ALL=(ALL) NOPASSWD: /bin/ls, /bin/cat"
+    assert sum("NOPASSWD" in issue for issue in findings[0].issues) == 1
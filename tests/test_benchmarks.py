@@ -0,0 +1,34 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure the repository root is in path so the benchmarks package is importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, parse_size
+
+
+def _read_tree(paths):
+    return [Path(path).read_text(encoding="utf-8") for path in paths]
+
+
+def test_generate_corpus_is_deterministic(tmp_path):
+    first = generate_corpus(str(tmp_path / "a"), 4096, CorpusSpec(file_size=1024))
+    second = generate_corpus(str(tmp_path / "b"), 4096, CorpusSpec(file_size=1024))
+
+    assert len(first) == len(second) >= 4
+    assert _read_tree(first) == _read_tree(second)
+    assert sum(os.path.getsize(p) for p in first) >= 4096
+
+
+def test_generate_corpus_seed_changes_content(tmp_path):
+    first = generate_corpus(str(tmp_path / "a"), 2048, CorpusSpec(seed=1))
+    second = generate_corpus(str(tmp_path / "b"), 2048, CorpusSpec(seed=2))
+    assert _read_tree(first) != _read_tree(second)
+
+
+def test_parse_size():
+    assert parse_size("512") == 512
+    assert parse_size("1K") == 1024
+    assert parse_size("10MB") == 10 * 1024**2
+    assert parse_size("1g") == 1024**3
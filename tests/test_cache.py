@@ -0,0 +1,82 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.cache import AuditCache, rules_fingerprint
+
+OLD_MTIME = 1_600_000_000
+
+
+@pytest.fixture
+def sudoers(tmp_path):
+    path = tmp_path / "sudoers"
+    path.write_text("root ALL=(ALL:ALL) ALL\n")
+    os.utime(path, (OLD_MTIME, OLD_MTIME))
+    return path
+
+
+def test_unchanged_file_skips_audit(tmp_path, sudoers):
+    auditor = SudoersAuditor()
+    first = AuditCache(str(tmp_path / "cache")).audit(auditor, str(sudoers))
+
+    cache = AuditCache(str(tmp_path / "cache"))
+    with (
+        patch.object(auditor, "audit_bytes") as audit_bytes,
+        patch("builtins.open", wraps=open) as mock_open,
+    ):
+        second = cache.audit(auditor, str(sudoers))
+    audit_bytes.assert_not_called()
+    # Only the cache entry is opened, not the audited file
+    assert all(str(sudoers) != call.args[0] for call in mock_open.call_args_list)
+
+    assert cache.stats() == {"hits": 1, "misses": 0}
+    assert second == first
+    assert second.findings[0].issues
+
+
+def test_changed_content_is_audited_again(tmp_path, sudoers):
+    auditor = SudoersAuditor()
+    cache = AuditCache(str(tmp_path / "cache"))
+    cache.audit(auditor, str(sudoers))
+
+    sudoers.write_text("user ALL=(root) NOPASSWD: /usr/bin/ls\n")
+    os.utime(sudoers, (OLD_MTIME + 10, OLD_MTIME + 10))
+    result = cache.audit(auditor, str(sudoers))
+
+    assert cache.stats() == {"hits": 0, "misses": 2}
+    assert any("NOPASSWD" in i for f in result.findings for i in f.issues)
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path, sudoers):
+    auditor = SudoersAuditor()
+    cache = AuditCache(str(tmp_path / "cache"))
+    cache.audit(auditor, str(sudoers))
+
+    os.utime(sudoers, (OLD_MTIME + 10, OLD_MTIME + 10))
+    with patch.object(auditor, "audit_bytes") as audit_bytes:
+        cache.audit(auditor, str(sudoers))
+    audit_bytes.assert_not_called()
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_rules_fingerprint_invalidates_entries(tmp_path, sudoers):
+    auditor = SudoersAuditor()
+    AuditCache(str(tmp_path / "cache")).audit(auditor, str(sudoers))
+
+    cache = AuditCache(str(tmp_path / "cache"), fingerprint="other-rules")
+    cache.audit(auditor, str(sudoers))
+    assert cache.stats() == {"hits": 0, "misses": 1}
+    assert rules_fingerprint() == rules_fingerprint()
+
+
+def test_read_errors_are_not_cached(tmp_path):
+    cache = AuditCache(str(tmp_path / "cache"))
+    result = cache.audit(SudoersAuditor(), str(tmp_path / "missing"))
+    assert result.error == "File not found."
+    assert os.listdir(tmp_path / "cache") == []
@@ -1,4 +1,6 @@
+import json
 import os
+import subprocess
 import sys
 import pytest
 from unittest.mock import patch
@@ -7,6 +9,7 @@ from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
 from sudoers_audit.cli import main
+from sudoers_audit.runner import iter_results
 
 
 @pytest.fixture
@@ -40,3 +43,102 @@ def test_cli_directory_scan(scan_dir_path, capsys):
 
     # malicious.sudoers has "user ALL=(ALL) NOPASSWD: /bin/sh" -> WARNING: 'NOPASSWD' tag used
     assert "WARNING: 'NOPASSWD' tag used" in output
+
+
+def test_cli_directory_scan_parallel_matches_serial(scan_dir_path, capsys):
+    """Test that --jobs produces the same, deterministic output as a serial run."""
+    outputs = []
+    for jobs in ("1", "2"):
+        with patch.object(sys, "argv", ["sudoers-audit", scan_dir_path, "-j", jobs]):
+            main()
+        outputs.append(capsys.readouterr().out)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].index("clean.sudoers") < outputs[0].index("malicious.sudoers")
+
+
+def test_cli_dedupe_matches_full_audit(tmp_path, capsys):
+    """Test that --dedupe reuses results for identical files without changing output."""
+    template = "%admin ALL=(ALL) NOPASSWD: /usr/bin/vim\n"
+    for host in ("a", "b", "c"):
+        (tmp_path / host).write_text(template)
+    (tmp_path / "d").write_text("Defaults env_keep += LD_PRELOAD\n")
+
+    outputs = []
+    for extra in ([], ["--dedupe"]):
+        with patch.object(sys, "argv", ["sudoers-audit", str(tmp_path), *extra]):
+            main()
+        outputs.append(capsys.readouterr())
+
+    assert outputs[0].out == outputs[1].out
+    assert outputs[1].out.count("NOPASSWD") >= 3
+    assert "Deduplicated 2 of 4 files (2 unique)." in outputs[1].err
+
+
+def test_cli_jsonl_to_stdout(scan_dir_path, capsys):
+    """Test that jsonl records go to stdout, with nothing else mixed in."""
+    with patch.object(
+        sys, "argv", ["sudoers-audit", scan_dir_path, "-f", "jsonl", "-o", "-"]
+    ):
+        main()
+
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) > 1
+    assert {"file", "line", "content", "severity", "rule_id", "message"} <= set(
+        records[0]
+    )
+    assert any(r["rule_id"] == "SUDO002" for r in records)
+
+
+def test_jsonl_streams_each_finding(tmp_path, capsys):
+    """Test that jsonl records come from findings as they are produced."""
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text("".join(f"user{i} ALL=(ALL) NOPASSWD: ALL\n" for i in range(3)))
+    missing = str(tmp_path / "missing")
+
+    streamed = list(iter_results([str(sudoers), missing], stream=True))
+    assert [len(r.findings) for r in streamed] == [1, 1, 1, 0]
+    assert streamed[-1].error == "File not found."
+
+    argv = ["sudoers-audit", str(sudoers), "-f", "jsonl"]
+    with patch.object(sys, "argv", argv):
+        main()
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    with patch.object(sys, "argv", [*argv, "--profile"]):
+        main()
+    per_file = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records == per_file
+    assert [r["line"] for r in records if r["rule_id"] == "SUDO002"] == [1, 2, 3]
+
+
+def test_cli_jsonl_closed_stdout_exits_quietly(tmp_path):
+    """Test that a reader closing stdout early (`| head`) is not an error."""
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text("bob ALL=(ALL) NOPASSWD: ALL\n" * 20000)
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "sudoers_audit", str(sudoers), "-f", "jsonl"],
+        env=dict(os.environ, PYTHONPATH=src),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    json.loads(proc.stdout.readline())
+    proc.stdout.close()
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+
+    assert proc.wait() == 1
+    assert stderr == b""
+
+
+def test_cli_errors_go_to_stderr(tmp_path, capsys):
+    """Test that error messages stay out of the stdout report stream."""
+    with patch.object(sys, "argv", ["sudoers-audit", str(tmp_path / "missing")]):
+        with pytest.raises(SystemExit):
+            main()
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "ERROR: Target path does not exist." in captured.err
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.parser import LineKind, parse_line
+from sudoers_audit.rules import get_all_rules
+from sudoers_audit.rules.base import LineRule
+from sudoers_audit.rules.defaults import SudoDefaultsRule
+from sudoers_audit.rules.dispatch import RuleDispatcher
+from sudoers_audit.rules.privileges import FullPrivilegeRule, NopasswdRule
+
+
+class TextOnlyRule:
+    def check(self, line):
+        return ["LOW: custom rule"] if "custom" in line else []
+
+
+class KeywordRule:
+    def __init__(self, *keywords):
+        self.keywords = keywords
+
+    def check(self, line):
+        return []
+
+
+def test_rules_routed_by_kind():
+    dispatcher = RuleDispatcher(get_all_rules())
+    checks = dispatcher.checks_for(parse_line("Defaults !use_pty"))
+    owners = {type(check.__self__) for check in checks}
+    assert SudoDefaultsRule in owners
+    assert NopasswdRule not in owners
+
+    assert dispatcher.checks_for(parse_line("# comment")) == []
+    assert dispatcher.checks_for(parse_line("#includedir /etc/sudoers.d")) == []
+
+
+def test_keyword_prefilter_skips_rules():
+    dispatcher = RuleDispatcher([NopasswdRule(), FullPrivilegeRule()])
+    assert dispatcher.checks_for(parse_line("bob ALL = /bin/ls")) == []
+    checks = dispatcher.checks_for(parse_line("bob ALL = (ALL) NOPASSWD: /bin/ls"))
+    assert len(checks) == 2
+
+
+def test_keyword_prefilter_overlapping_keywords():
+    dispatcher = RuleDispatcher(
+        [KeywordRule("(ALL"), KeywordRule("ALL)"), KeywordRule("ALL")]
+    )
+    assert dispatcher.keywords_in("x = (ALL) y") == {"(ALL", "ALL)", "ALL"}
+    assert dispatcher.keywords_in("x = ALL") == {"ALL"}
+
+
+def test_text_only_rules_still_supported():
+    auditor = SudoersAuditor()
+    auditor.rules.append(TextOnlyRule())
+    auditor.dispatcher = RuleDispatcher(auditor.rules)
+    assert "LOW: custom rule" in auditor.analyze_line(1, "custom ALL = /bin/ls")
+    assert parse_line("custom ALL = /bin/ls").kind is LineKind.USER_SPEC
+
+
+def test_defaults_lines_not_flagged_as_negation():
+    auditor = SudoersAuditor()
+    issues = auditor.analyze_line(1, "Defaults env_reset, !requiretty")
+    assert not any("Negation rule" in i for i in issues)
+    assert any("!requiretty" in i for i in issues)
+
+
+def test_kind_routing_keeps_findings_on_defaults_and_aliases():
+    auditor = SudoersAuditor()
+    issues = auditor.analyze_line(1, "Defaults logfile=/var/log/sudo*")
+    assert any("Wildcard detected in binary path" in i for i in issues)
+    issues = auditor.analyze_line(1, "Cmnd_Alias X = (ALL) ALL")
+    assert any("'ALL=(ALL) ALL' grant" in i for i in issues)
+    issues = auditor.analyze_line(1, "Cmnd_Alias X = NOPASSWD: /bin/ls")
+    assert any("'NOPASSWD' tag used" in i for i in issues)
+
+
+def test_line_rule_requires_check_parsed():
+    class Incomplete(LineRule):
+        keywords = ("ALL",)
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -13,6 +13,13 @@ class TestHardeningChecks(unittest.TestCase):
         issues = self.auditor.analyze_line(1, line)
         self.assertTrue(any("Wildcard detected in binary path" in i for i in issues))
 
+    def test_wildcard_in_assignment_argument(self):
+        # Only the field up to a second '=' counts as the binary path
+        line = "user ALL=/usr/bin/env A=/bin/*"
+        issues = self.auditor.analyze_line(1, line)
+        self.assertTrue(any("HIGH: Wildcard '*' detected" in i for i in issues))
+        self.assertFalse(any("binary path" in i for i in issues))
+
     def test_privilege_scope_runas_all(self):
         line = "bob ALL=(ALL:ALL) ALL"
         issues = self.auditor.analyze_line(1, line)
@@ -0,0 +1,94 @@
+import os
+import sys
+from unittest.mock import patch
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit import includes
+from sudoers_audit.cli import main
+from sudoers_audit.includes import include_directives, load_policy
+from sudoers_audit.runner import iter_results
+
+
+def _policy(tmp_path):
+    (tmp_path / "sudoers.d").mkdir()
+    (tmp_path / "sudoers").write_text(
+        'Cmnd_Alias SHELLS = /bin/bash\n@includedir sudoers.d\n#include "extra file"\n'
+    )
+    (tmp_path / "sudoers.d" / "20-bob").write_text(
+        "bob ALL = SHELLS\n@include ../sudoers\n"
+    )
+    (tmp_path / "sudoers.d" / "10-shared").write_text("@include ../extra\\ file\n")
+    (tmp_path / "sudoers.d" / "ignored.conf").write_text("nobody ALL = ALL\n")
+    (tmp_path / "sudoers.d" / "ignored~").write_text("nobody ALL = ALL\n")
+    (tmp_path / "extra file").write_text("root ALL=(ALL:ALL) ALL\n")
+    return str(tmp_path / "sudoers")
+
+
+def test_include_directives(tmp_path):
+    root = _policy(tmp_path)
+    with open(root, "rb") as f:
+        directives = list(include_directives(root, f.read()))
+
+    assert directives == [
+        (
+            2,
+            "@includedir sudoers.d",
+            [
+                str(tmp_path / "sudoers.d" / "10-shared"),
+                str(tmp_path / "sudoers.d" / "20-bob"),
+            ],
+        ),
+        (3, '#include "extra file"', [str(tmp_path / "extra file")]),
+    ]
+
+
+def test_load_policy_reads_each_file_once(tmp_path):
+    root = _policy(tmp_path)
+    loads = []
+    load = includes._load
+
+    with patch.object(includes, "_load", lambda path: loads.append(path) or load(path)):
+        files = load_policy([root])
+
+    assert [os.path.relpath(f.path, tmp_path) for f in files] == [
+        "sudoers",
+        os.path.join("sudoers.d", "10-shared"),
+        "extra file",
+        os.path.join("sudoers.d", "20-bob"),
+    ]
+    assert len(loads) == len(set(map(os.path.realpath, loads))) == 4
+    assert files[3].cycles == [(2, "@include ../sudoers", root)]
+
+
+def test_follow_includes_audits_policy(tmp_path):
+    root = _policy(tmp_path)
+    (tmp_path / "sudoers").write_text(
+        (tmp_path / "sudoers").read_text() + "@include missing\n"
+    )
+
+    results = {
+        os.path.relpath(r.file_path, tmp_path): r
+        for r in iter_results([root], follow_includes=True)
+    }
+
+    bob = results[os.path.join("sudoers.d", "20-bob")]
+    assert "(via Cmnd_Alias SHELLS)" in " ".join(map(str, bob.findings[0].issues))
+    assert str(bob.findings[1].issues[0]).startswith("MEDIUM: Include cycle detected.")
+    assert results["extra file"].findings[0].line_number == 1
+    assert results["missing"].error == "File not found."
+
+
+def test_follow_includes_warns_about_ignored_flags(tmp_path, capsys):
+    root = _policy(tmp_path)
+    argv = ["sudoers-audit", root, "--follow-includes", "-j", "2", "--dedupe"]
+    argv += ["--cache-dir", str(tmp_path / "cache")]
+    with patch.object(sys, "argv", argv):
+        main()
+
+    err = capsys.readouterr().err
+    for flag in ("--jobs", "--cache-dir", "--dedupe"):
+        assert f"WARNING: --follow-includes ignores {flag}." in err
+    assert "Deduplicated" not in err
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,57 @@
+import os
+import pickle
+import sys
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.issues import Issue, Severity, as_issue
+
+
+def test_issue_renders_lazily():
+    issue = Issue(Severity.HIGH, "SUDO007", "Relative path '{}'.", ("vim",))
+
+    assert issue.message == "Relative path 'vim'."
+    assert str(issue) == "HIGH: Relative path 'vim'."
+    assert "Relative path" in issue
+    assert not hasattr(issue, "__dict__")
+
+
+def test_issue_equality_and_pickling():
+    issue = Issue(Severity.WARNING, "SUDO004", "GTFOBins ({}).", ("vi",))
+    copy = pickle.loads(pickle.dumps(issue))
+
+    assert copy == issue
+    assert hash(copy) == hash(issue)
+    assert copy != Issue(Severity.WARNING, "SUDO004", "GTFOBins ({}).", ("ed",))
+
+
+def test_issue_via_origin():
+    issue = Issue(Severity.WARNING, "SUDO004", "GTFOBins ({}).", ("vi",))
+    via = issue.via("Cmnd_Alias EDITORS")
+
+    assert str(via) == "WARNING: GTFOBins (vi). (via Cmnd_Alias EDITORS)"
+    assert via.rule_id == "SUDO004"
+
+
+def test_legacy_string_coercion():
+    issue = as_issue("CRITICAL: 'ALL' command granted.")
+    assert (issue.severity, issue.rule_id) == (Severity.CRITICAL, "SUDO000")
+    assert str(issue) == "CRITICAL: 'ALL' command granted."
+    assert as_issue("free text").severity is Severity.WARNING
+
+
+def test_rules_emit_stable_rule_ids():
+    auditor = SudoersAuditor()
+    issues = auditor.analyze_line(1, "user ALL=(ALL) NOPASSWD: ALL")
+
+    assert [(i.severity, i.rule_id) for i in issues] == [
+        (Severity.CRITICAL, "SUDO001"),
+        (Severity.WARNING, "SUDO002"),
+        (Severity.MEDIUM, "SUDO009"),
+    ]
+    # Parameterless issues are shared, not rebuilt per line
+    again = auditor.analyze_line(2, "other ALL=(ALL) NOPASSWD: ALL")
+    nopasswd = [i for i in issues if i.rule_id == "SUDO002"][0]
+    assert any(i is nopasswd for i in again)
@@ -4,7 +4,12 @@ import os
 # Ensure src is in path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from sudoers_audit.utils import clean_command_string, split_sudoers_commands
+from sudoers_audit.parser import LineKind, iter_logical_lines, parse_line
+from sudoers_audit.utils import (
+    clean_command_string,
+    command_tags,
+    split_sudoers_commands,
+)
 
 
 def test_split_commands_simple():
@@ -50,3 +55,71 @@ def test_clean_command_overrides():
 
 def test_clean_command_digest():
     assert clean_command_string("sha224:abcdef123123 /bin/ls") == "/bin/ls"
+
+
+def test_clean_command_prefix_heavy():
+    command = "(root:wheel) NOPASSWD: SETENV: sha224:0GomF8mNN3wlDt1H+/== /bin/x -y"
+    assert clean_command_string(command) == "/bin/x -y"
+    assert (
+        clean_command_string("(ALL) (ALL) EXEC: !requiretty env_reset=true /bin/ls")
+        == "/bin/ls"
+    )
+    # Options alone leave no command behind
+    assert clean_command_string("NOPASSWD: !requiretty") == ""
+
+
+def test_command_tags():
+    assert command_tags("(root) NOPASSWD: sha224:abc= SETENV:") == [
+        "NOPASSWD",
+        "SETENV",
+    ]
+
+
+def test_parse_line_user_spec():
+    parsed = parse_line("  bob ALL = (root:wheel) NOPASSWD: SETENV: /bin/ls -l, vi  ")
+    assert parsed.kind is LineKind.USER_SPEC
+    assert parsed.text == "bob ALL = (root:wheel) NOPASSWD: SETENV: /bin/ls -l, vi"
+    assert parsed.lhs == "bob ALL"
+    assert parsed.runas == "root:wheel"
+    assert parsed.tags == ("NOPASSWD", "SETENV")
+    assert parsed.cleaned == ("/bin/ls -l", "vi")
+    assert parsed.argv == (("/bin/ls", "-l"), ("vi",))
+
+
+def test_parse_line_kinds():
+    assert parse_line("").kind is LineKind.COMMENT
+    assert parse_line("# comment").kind is LineKind.COMMENT
+    assert parse_line("#include /etc/sudoers.local").kind is LineKind.INCLUDE
+    assert parse_line("@includedir /etc/sudoers.d").kind is LineKind.INCLUDE
+    assert parse_line("Defaults:bob !authenticate").kind is LineKind.DEFAULTS
+    assert parse_line("Cmnd_Alias SHELLS = /bin/sh").kind is LineKind.ALIAS
+    assert parse_line("Cmnd_Alias SHELLS = /bin/sh").alias_type == "Cmnd_Alias"
+
+
+def test_parse_line_defaults_has_no_commands():
+    parsed = parse_line('Defaults secure_path="/usr/sbin:/usr/bin"')
+    assert parsed.rhs == '"/usr/sbin:/usr/bin"'
+    assert parsed.commands == ()
+
+
+def test_iter_logical_lines_joins_continuations():
+    lines = [
+        "Cmnd_Alias SHELLS = /bin/sh, \\\n",
+        "    /bin/bash, \\\n",
+        "    /usr/bin/zsh\n",
+        "# a comment \\\n",
+        "root ALL=(ALL) ALL\n",
+    ]
+    assert list(iter_logical_lines(lines)) == [
+        (1, 3, "Cmnd_Alias SHELLS = /bin/sh, /bin/bash, /usr/bin/zsh"),
+        (4, 4, "# a comment \\"),
+        (5, 5, "root ALL=(ALL) ALL"),
+    ]
+
+
+def test_iter_logical_lines_escaped_backslash_and_eof():
+    lines = ["user ALL = /bin/echo \\\\\n", "user ALL = /bin/ls \\\n"]
+    assert list(iter_logical_lines(lines)) == [
+        (1, 1, "user ALL = /bin/echo \\\\"),
+        (2, 2, "user ALL = /bin/ls"),
+    ]
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.cli import main
+from sudoers_audit.profiling import Profiler
+
+
+def test_profiler_records_rules_and_files(tmp_path):
+    d = tmp_path / "sudoers"
+    d.write_text("Defaults !use_pty\nuser ALL=(ALL) NOPASSWD: /bin/sh\n")
+
+    profiler = Profiler()
+    auditor = profiler.instrument(SudoersAuditor())
+    result = auditor.audit_file(str(d))
+
+    assert any("NOPASSWD" in i for f in result.findings for i in f.issues)
+    data = profiler.to_dict()
+    assert data["rules"]["NopasswdRule"]["calls"] == 1
+    assert data["rules"]["NopasswdRule"]["hit_rate"] == 1.0
+    assert data["rules"]["SudoDefaultsRule"]["hits"] == 1
+    assert data["files"][0]["file_path"] == str(d)
+    assert "NopasswdRule" in profiler.summary_table()
+    assert "cover the 2 lines that missed the line cache" in profiler.summary_table()
+
+
+def test_profiler_leaves_other_auditors_untouched():
+    Profiler().instrument(SudoersAuditor())
+    auditor = SudoersAuditor()
+    assert "parse_line" not in vars(auditor)
+    assert "audit_file" not in vars(auditor)
+
+
+def test_cli_profile_output(tmp_path, capsys):
+    d = tmp_path / "sudoers"
+    d.write_text("root ALL=(ALL:ALL) ALL\n")
+    output = tmp_path / "profile.json"
+
+    argv = ["sudoers-audit", str(d), "--profile", "--profile-output", str(output)]
+    with patch.object(sys, "argv", argv):
+        main()
+
+    captured = capsys.readouterr()
+    assert "AllCommandRule" in captured.err
+    assert "CRITICAL: 'ALL' command granted" in captured.out
+    assert json.loads(output.read_text())["rules"]["AllCommandRule"]["hits"] == 1
@@ -1,6 +1,7 @@
 import pytest
 import json
 from sudoers_audit.auditor import FileAuditResult, Finding
+from sudoers_audit.issues import Issue, Severity
 from sudoers_audit.reporting import ReportGenerator
 
 
@@ -72,3 +73,112 @@ def test_generate_sarif(tmp_path, sample_results):
             assert res["locations"][0]["physicalLocation"]["region"]["startLine"] == 10
 
     assert found_issue
+
+
+def test_generate_html_accepts_iterator(tmp_path, sample_results):
+    output_file = tmp_path / "report.html"
+    ReportGenerator.generate_html(iter(sample_results), str(output_file))
+
+    content = output_file.read_text(encoding="utf-8")
+    assert content.count('class="file-section"') == 2
+    assert content.rstrip().endswith("</html>")
+
+
+def test_generate_sarif_compact_streams_iterator(tmp_path, sample_results):
+    pretty_file = tmp_path / "pretty.sarif"
+    compact_file = tmp_path / "compact.sarif"
+    ReportGenerator.generate_sarif(iter(sample_results), str(pretty_file))
+    ReportGenerator.generate_sarif(
+        iter(sample_results), str(compact_file), pretty=False
+    )
+
+    assert "\n" not in compact_file.read_text(encoding="utf-8")
+    assert compact_file.stat().st_size < pretty_file.stat().st_size
+    with open(compact_file, encoding="utf-8") as f, open(pretty_file) as g:
+        assert json.load(f) == json.load(g)
+
+
+def test_generate_sarif_no_results(tmp_path):
+    output_file = tmp_path / "report.sarif"
+    ReportGenerator.generate_sarif([], str(output_file))
+
+    with open(output_file, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["runs"][0]["results"] == []
+
+
+def test_continued_line_spans_range(tmp_path):
+    results = [
+        FileAuditResult(
+            file_path="/etc/sudoers",
+            findings=[
+                Finding(
+                    line_number=3,
+                    line_content="Cmnd_Alias SHELLS = /bin/sh, /bin/bash",
+                    issues=["WARNING: GTFOBins detected."],
+                    end_line_number=5,
+                )
+            ],
+        )
+    ]
+    sarif_file = tmp_path / "report.sarif"
+    html_file = tmp_path / "report.html"
+    ReportGenerator.generate_sarif(results, str(sarif_file))
+    ReportGenerator.generate_html(results, str(html_file))
+
+    data = json.loads(sarif_file.read_text(encoding="utf-8"))
+    region = data["runs"][0]["results"][0]["locations"][0]["physicalLocation"]
+    assert region["region"] == {"startLine": 3, "endLine": 5}
+    assert '<span class="line-info">3-5</span>' in html_file.read_text(encoding="utf-8")
+
+
+def test_generate_jsonl(tmp_path, sample_results):
+    output_file = tmp_path / "report.jsonl"
+    ReportGenerator.generate_jsonl(iter(sample_results), str(output_file))
+
+    records = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert records == [
+        {
+            "file": "/etc/sudoers",
+            "line": 10,
+            "end_line": 10,
+            "content": "root ALL=(ALL:ALL) ALL",
+            "severity": "CRITICAL",
+            "rule_id": "SUDO000",
+            "message": "'ALL' command granted.",
+        },
+        {
+            "file": "/etc/sudoers.d/test",
+            "line": None,
+            "end_line": None,
+            "content": None,
+            "severity": "ERROR",
+            "rule_id": None,
+            "message": "Permission denied.",
+        },
+    ]
+
+
+def test_writers_use_issue_classification(tmp_path):
+    # The message mentions ALL and CRITICAL, which must not sway classification
+    issue = Issue(Severity.LOW, "SUDO014", "Note ALL {} output.", ("CRITICAL",))
+    results = [
+        FileAuditResult(
+            file_path="/etc/sudoers",
+            findings=[Finding(line_number=1, line_content="x", issues=[issue])],
+        )
+    ]
+    sarif_file = tmp_path / "report.sarif"
+    html_file = tmp_path / "report.html"
+    jsonl_file = tmp_path / "report.jsonl"
+    ReportGenerator.generate_sarif(results, str(sarif_file))
+    ReportGenerator.generate_html(results, str(html_file))
+    ReportGenerator.generate_jsonl(results, str(jsonl_file))
+
+    sarif = json.loads(sarif_file.read_text())["runs"][0]["results"][0]
+    assert (sarif["ruleId"], sarif["level"]) == ("SUDO014", "warning")
+    assert sarif["message"]["text"] == "LOW: Note ALL CRITICAL output."
+    assert '<li class="">LOW: Note ALL CRITICAL output.</li>' in html_file.read_text()
+    record = json.loads(jsonl_file.read_text())
+    assert (record["severity"], record["rule_id"]) == ("LOW", "SUDO014")
+    assert record["message"] == "Note ALL CRITICAL output."
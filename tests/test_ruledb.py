@@ -0,0 +1,64 @@
+import marshal
+import os
+import sys
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit import ruledb
+from sudoers_audit.data import RISKY_BINARIES
+from sudoers_audit.parser import parse_line
+from sudoers_audit.rules.risky_binaries import GTFOBinsIndex, RiskyBinariesRule
+
+
+def test_roundtrip_matches_in_memory_index(tmp_path):
+    path = ruledb.write_ruledb(str(tmp_path / "ruledb.bin"))
+    db = ruledb.load_ruledb(path)
+
+    built = GTFOBinsIndex(RISKY_BINARIES)
+    loaded = GTFOBinsIndex.from_tables(**db["gtfobins"])
+    assert loaded.tables() == built.tables()
+
+    rule = RiskyBinariesRule(loaded)
+    issues = rule.check_parsed(parse_line("user ALL=(root) /usr/bin/vim, /bin/if top"))
+    assert "vim" in issues[0] and "if top" in issues[0]
+
+
+def test_missing_or_corrupt_db_is_ignored(tmp_path):
+    path = str(tmp_path / "ruledb.bin")
+    assert ruledb.load_ruledb(path) is None
+
+    ruledb.write_ruledb(path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[-10] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(data)
+    assert ruledb.load_ruledb(path) is None
+
+    with open(path, "wb") as f:
+        f.write(b"not a rule database")
+    assert ruledb.load_ruledb(path) is None
+
+
+def test_stale_or_foreign_db_is_ignored(tmp_path, monkeypatch):
+    path = ruledb.write_ruledb(str(tmp_path / "ruledb.bin"))
+
+    monkeypatch.setattr(ruledb, "sources_checksum", lambda: 1)
+    assert ruledb.load_ruledb(path) is None
+
+    # Without sources on disk (frozen binary) only the body checksum counts
+    monkeypatch.setattr(ruledb, "sources_checksum", lambda: None)
+    assert ruledb.load_ruledb(path) is not None
+
+    monkeypatch.setattr(ruledb, "RULEDB_FORMAT", ruledb.RULEDB_FORMAT + 1)
+    assert ruledb.load_ruledb(path) is None
+
+
+def test_db_from_another_interpreter_is_ignored(tmp_path):
+    path = ruledb.write_ruledb(str(tmp_path / "ruledb.bin"))
+    with open(path, "rb") as f:
+        header, body = marshal.loads(f.read())
+    with open(path, "wb") as f:
+        f.write(marshal.dumps(((header[0], "other-99", *header[2:]), body)))
+    assert ruledb.load_ruledb(path) is None
@@ -0,0 +1,48 @@
+import os
+import sys
+
+# Ensure the repository root is in path so the benchmarks package is importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_startup import (
+    IMPORT_BUDGET_MS,
+    eager_modules,
+    import_time_ms,
+    loaded_modules,
+)
+
+
+def test_cli_import_is_lazy():
+    assert eager_modules("import sudoers_audit.cli") == []
+
+
+def test_cli_import_defers_auditor():
+    # Argument parsing and --help need neither the auditor nor the runner
+    modules = loaded_modules("import sudoers_audit.cli")
+    assert "sudoers_audit.auditor" not in modules
+    assert "sudoers_audit.runner" not in modules
+
+
+def test_stdout_audit_skips_report_writers(tmp_path):
+    d = tmp_path / "sudoers"
+    d.write_text("user ALL=(ALL) NOPASSWD: /usr/bin/vim\n")
+    code = (
+        f"import sys\nsys.argv = ['sudoers-audit', {str(d)!r}]\n"
+        "from sudoers_audit.cli import main\nmain()"
+    )
+    assert eager_modules(code, allowed=("sudoers_audit.data",)) == []
+
+
+def test_comment_only_audit_skips_rule_data(tmp_path):
+    d = tmp_path / "sudoers"
+    d.write_text("# nothing granted here\nDefaults use_pty\n")
+    code = (
+        f"import sys\nsys.argv = ['sudoers-audit', {str(d)!r}]\n"
+        "from sudoers_audit.cli import main\nmain()"
+    )
+    assert eager_modules(code) == []
+
+
+def test_cli_import_time_budget():
+    # Best of a few runs, so a busy machine does not fail the budget
+    assert min(import_time_ms() for _ in range(3)) < IMPORT_BUDGET_MS
@@ -0,0 +1,193 @@
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.auditor import SudoersAuditor
+from sudoers_audit.statcache import StatCache
+
+
+def test_stat_cache_counts_hits_and_misses(tmp_path):
+    cache = StatCache()
+    path = str(tmp_path)
+    assert cache.stat(path).st_mode == os.stat(path).st_mode
+    cache.stat(path)
+    assert cache.stat(str(tmp_path / "missing")) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+
+def test_stat_cache_is_bounded(tmp_path):
+    cache = StatCache(maxsize=2)
+    for name in ("a", "b", "c"):
+        cache.stat(str(tmp_path / name))
+    assert cache.stats()["size"] == 2
+
+
+def test_stat_cache_reraises_errors():
+    cache = StatCache()
+    with patch("os.stat", side_effect=PermissionError(13, "denied")):
+        for _ in range(2):
+            try:
+                cache.stat("/root/secret")
+            except PermissionError:
+                pass
+            else:
+                raise AssertionError("PermissionError not raised")
+    assert cache.stats()["misses"] == 1
+
+
+def test_repeated_binaries_are_stat_once():
+    auditor = SudoersAuditor()
+    real_stat = os.stat
+    with patch("os.stat", side_effect=real_stat) as mock_stat:
+        for _ in range(50):
+            auditor.check_file_permissions("/bin/sh")
+    # One call for the binary and one for its parent directory
+    assert mock_stat.call_count == 2
+    assert auditor.stat_cache.hits > 0
+
+
+def test_prefetch_stats_on_worker_threads(tmp_path):
+    cache = StatCache(threads=4)
+    paths = [str(tmp_path / name) for name in ("a", "b", "c")] + [str(tmp_path)]
+    real_stat = os.stat
+    threads = []
+
+    def recording_stat(path, *args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return real_stat(path, *args, **kwargs)
+
+    with patch("os.stat", side_effect=recording_stat):
+        cache.prefetch(paths + paths)
+        assert cache.stat(str(tmp_path)) is not None
+        assert cache.stat(paths[0]) is None
+    assert len(threads) == 4
+    assert all(name.startswith("stat") for name in threads)
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 4}
+
+
+def test_threaded_permission_checks_match_inline(tmp_path):
+    writable = tmp_path / "writable"
+    writable.write_text("")
+    writable.chmod(0o777)
+    lines = [
+        f"user{i} ALL=(root) {tmp_path}/missing{i}, {writable}, /bin/sh\n"
+        for i in range(20)
+    ]
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text("".join(lines))
+
+    inline = SudoersAuditor(stat_threads=1).audit_file(str(sudoers), True)
+    real_stat = os.stat
+    threads = set()
+
+    def recording_stat(path, *args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return real_stat(path, *args, **kwargs)
+
+    with patch("os.stat", side_effect=recording_stat):
+        threaded = SudoersAuditor(stat_threads=4).audit_file(str(sudoers), True)
+
+    assert threaded == inline
+    assert any("writable by others" in i for f in threaded.findings for i in f.issues)
+    # Every stat of the permission checks was made ahead, by the pool
+    assert threads and all(name.startswith("stat") for name in threads)
+
+
+def test_prefetch_batches_fit_in_the_stat_cache(tmp_path):
+    lines = [
+        f"user{i} ALL=(root) {tmp_path}/d{i}/a, {tmp_path}/d{i}/b\n" for i in range(20)
+    ]
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text("".join(lines))
+
+    auditor = SudoersAuditor(stat_threads=4)
+    auditor.stat_cache.maxsize = 8
+    real_stat = os.stat
+    calls = []
+
+    def recording_stat(path, *args, **kwargs):
+        calls.append((path, threading.current_thread().name))
+        return real_stat(path, *args, **kwargs)
+
+    with patch("os.stat", side_effect=recording_stat):
+        auditor.audit_file(str(sudoers), True)
+
+    # Nothing prefetched was evicted and stat'ed again by the checks
+    stated = [path for path, _ in calls if path != str(sudoers)]
+    assert len(stated) == len(set(stated)) == 60
+    assert all(name.startswith("stat") for path, name in calls if path in stated)
+
+
+def test_scandir_prefetch_lists_each_directory_once(tmp_path):
+    (tmp_path / "present").write_text("")
+    paths = [str(tmp_path / name) for name in ("present", "gone1", "gone2")]
+    paths.append(str(tmp_path))
+    cache = StatCache(threads=1, scandir=True)
+    real_stat = os.stat
+    stat_calls = []
+
+    def recording_stat(path, *args, **kwargs):
+        stat_calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    with patch("os.stat", side_effect=recording_stat):
+        cache.prefetch(paths)
+    # The directory itself is stat'ed; absent names need no syscall
+    assert stat_calls == [str(tmp_path)]
+
+    reference = StatCache(threads=1)
+    for path in paths:
+        expected = reference.stat(path)
+        entry = cache.stat(path)
+        assert (entry is None) == (expected is None)
+        if entry is not None:
+            assert (entry.st_ino, entry.st_mode) == (expected.st_ino, expected.st_mode)
+    assert cache.stats()["hits"] == len(paths)
+
+
+def test_scandir_prefetch_falls_back_when_unlistable(tmp_path):
+    (tmp_path / "present").write_text("")
+    paths = [str(tmp_path / "present"), str(tmp_path / "gone")]
+    cache = StatCache(threads=1, scandir=True)
+    with patch("os.scandir", side_effect=PermissionError(13, "denied")):
+        cache.prefetch(paths)
+    assert cache.stat(paths[0]) is not None
+    assert cache.stat(paths[1]) is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_scandir_permission_checks_match_inline(tmp_path):
+    writable = tmp_path / "writable"
+    writable.write_text("")
+    writable.chmod(0o777)
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text(
+        f"user ALL=(root) {writable}, {tmp_path}/missing, /bin/sh, /nonexistent/x\n"
+    )
+
+    inline = SudoersAuditor(stat_threads=1).audit_file(str(sudoers), True)
+    scanned = SudoersAuditor(stat_threads=1, stat_scandir=True).audit_file(
+        str(sudoers), True
+    )
+    assert scanned == inline
+    assert any("not found" in i for f in scanned.findings for i in f.issues)
+
+
+def test_scandir_dot_entries_match_inline(tmp_path):
+    (tmp_path / "sub").mkdir()
+    paths = [f"{tmp_path}/sub/.", f"{tmp_path}/sub/..", f"{tmp_path}/gone/.."]
+    sudoers = tmp_path / "sudoers"
+    sudoers.write_text(f"user ALL=(root) {', '.join(paths)}\n")
+
+    inline = SudoersAuditor(stat_threads=1).audit_file(str(sudoers), True)
+    scanned = SudoersAuditor(stat_threads=1, stat_scandir=True).audit_file(
+        str(sudoers), True
+    )
+    assert scanned == inline
+    issues = [str(i) for f in scanned.findings for i in f.issues]
+    assert not any(f"'{paths[0]}' not found" in i for i in issues)
+    assert any(f"'{paths[2]}' not found" in i for i in issues)
@@ -67,7 +67,7 @@ def test_malicious_gtfobins(auditor):
 
     # Check specifically for vim and bash
     all_issues = [issue for finding in result.findings for issue in finding.issues]
-    combined_issues = " ".join(all_issues)
+    combined_issues = " ".join(map(str, all_issues))
     assert "vim" in combined_issues
     assert "bash" in combined_issues
 
@@ -80,7 +80,7 @@ def test_malicious_mixed(auditor):
     )  # We expect at least 4 findings based on the file content
 
     all_issues = [issue for finding in result.findings for issue in finding.issues]
-    combined_issues = " ".join(all_issues)
+    combined_issues = " ".join(map(str, all_issues))
 
     assert "NOPASSWD" in combined_issues
     assert "Wildcard" in combined_issues
@@ -0,0 +1,150 @@
+import io
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sudoers_audit.cli import main
+from sudoers_audit.runner import AuditSession
+from sudoers_audit.watch import InotifyWatcher, PollingWatcher, WatchState, run_watch
+
+
+def test_refresh_reports_new_and_resolved(tmp_path):
+    policy = tmp_path / "app"
+    policy.write_text("app ALL=(root) NOPASSWD: /bin/ls\n")
+    state = WatchState(AuditSession())
+
+    first = state.refresh([str(tmp_path)])
+    assert [(e["event"], e["line"]) for e in first] == [("new", 1)]
+    assert "NOPASSWD" in first[0]["issue"]
+
+    # Moving the line is not a change; only the new grant is reported
+    policy.write_text(
+        "# header\napp ALL=(root) NOPASSWD: /bin/ls\nroot ALL=(ALL:ALL) ALL\n"
+    )
+    events = state.refresh([str(policy)])
+    assert {e["event"] for e in events} == {"new"}
+    assert {e["line"] for e in events} == {3}
+
+    policy.unlink()
+    events = state.refresh([str(policy)])
+    assert len(events) == 3
+    assert {e["event"] for e in events} == {"resolved"}
+    assert state.refresh([str(tmp_path)]) == []
+
+
+def test_polling_watcher_detects_changes(tmp_path):
+    (tmp_path / "a").write_text("x\n")
+    watcher = PollingWatcher(str(tmp_path), interval=0.01)
+
+    (tmp_path / "b").write_text("y\n")
+    (tmp_path / "a").unlink()
+
+    assert watcher.changes(timeout=1) == {str(tmp_path / "a"), str(tmp_path / "b")}
+    assert watcher.changes(timeout=0.05) == set()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+def test_inotify_watcher_detects_changes(tmp_path):
+    (tmp_path / "sub").mkdir()
+    watcher = InotifyWatcher(str(tmp_path))
+    try:
+        (tmp_path / "sub" / "app").write_text("app ALL = ALL\n")
+        assert str(tmp_path / "sub" / "app") in watcher.changes(timeout=2)
+        assert watcher.changes(timeout=0.05) == set()
+    finally:
+        watcher.close()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+def test_inotify_watcher_single_file_replaced(tmp_path):
+    target = tmp_path / "sudoers"
+    target.write_text("")
+    watcher = InotifyWatcher(str(target))
+    try:
+        (tmp_path / "other").write_text("")
+        replacement = tmp_path / "sudoers.tmp"
+        replacement.write_text("root ALL = ALL\n")
+        os.replace(replacement, target)
+        assert watcher.changes(timeout=2) == {str(target)}
+    finally:
+        watcher.close()
+
+
+class _ScriptedWatcher:
+    """Runs one step per changes() call, then stops the watch loop."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.closed = False
+
+    def changes(self, timeout=None):
+        if not self.steps:
+            raise KeyboardInterrupt
+        return self.steps.pop(0)()
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_watch_emits_json_lines(tmp_path):
+    policy = tmp_path / "app"
+    policy.write_text("app ALL=(root) NOPASSWD: /bin/ls\n")
+
+    def edit():
+        policy.write_text("app ALL=(root) /bin/ls\n")
+        return {str(policy)}
+
+    watcher = _ScriptedWatcher(set, edit)
+    out = io.StringIO()
+    run_watch(str(tmp_path), out=out, watcher=watcher)
+
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [e["event"] for e in events] == ["new", "resolved"]
+    assert events[0]["file"] == str(policy)
+    assert watcher.closed
+
+
+@pytest.mark.parametrize(
+    "flags",
+    [
+        ["--format", "jsonl"],
+        ["--output", "report.csv"],
+        ["--jobs", "4"],
+        ["--cache-dir", "cache"],
+        ["--dedupe"],
+        ["--follow-includes"],
+    ],
+)
+def test_cli_watch_rejects_unsupported_flags(tmp_path, capsys, flags):
+    argv = ["sudoers-audit", str(tmp_path), "--watch", *flags]
+    with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as exc:
+        main()
+
+    assert exc.value.code == 2
+    assert f"--watch cannot be combined with {flags[0]}" in capsys.readouterr().err
+
+
+def test_cli_watch_prints_profile_when_interrupted(tmp_path, capsys):
+    (tmp_path / "app").write_text("root ALL=(ALL:ALL) ALL\n")
+
+    argv = ["sudoers-audit", str(tmp_path), "--watch", "--profile"]
+    with (
+        patch.object(sys, "argv", argv),
+        patch("sudoers_audit.watch.open_watcher", return_value=_ScriptedWatcher()),
+    ):
+        main()
+
+    captured = capsys.readouterr()
+    events = [json.loads(line) for line in captured.out.splitlines()]
+    assert events and {e["event"] for e in events} == {"new"}
+    assert "AllCommandRule" in captured.err